@@ -12,16 +12,20 @@ except ImportError:
 # - AttributeError: RequestContext.session has no setter (Flask 3.x + eventlet)
 # - Eventlet deprecation warnings and ConnectionAbortedError on Windows
 # Only load eventlet if SOCKETIO_ASYNC_MODE=eventlet (requires requirements_stable.txt + Python 3.11)
+# Production: SOCKETIO_ASYNC_MODE=gevent runs MJPEG viewers and UDP listeners as greenlets
+# on gevent's WSGI server (requires gevent + gevent-websocket)
 import os as _os_env
 if _os_env.environ.get('SOCKETIO_ASYNC_MODE') == 'eventlet':
     import eventlet
     eventlet.monkey_patch()
+elif _os_env.environ.get('SOCKETIO_ASYNC_MODE') == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
 
 from wsgiref.simple_server import WSGIServer
 from flask import Flask, jsonify, render_template, url_for, redirect, flash, session, request, Response
 import sys
 import os
-import glob
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin, login_user, LoginManager, login_required, logout_user, current_user
@@ -40,11 +44,21 @@ import threading
 import time
 import socket
 import select
-
-def dlog(msg):
-    with open("diagnostic_debug.log", "a") as f:
-        f.write(msg + "\n")
-        f.flush()
+from services.diagnostics import setup_logging, get_logger, get_packet_logger
+setup_logging('diagnostic_debug.log')
+from services.sign_service import sign_service
+from services.labels import label_to_text
+from services.auth import PasswordHasher, IdentityCache
+from services.worker_pool import WorkerPool
+from services.database import engine_options, configure_engine, migrate, check_queries
+from services.static_index import StaticAssetIndex
+from services.asset_pipeline import AssetPipeline
+from services.page_cache import PageCache
+from services.metrics import Registry, PROMETHEUS_CONTENT_TYPE
+import json
+
+log = get_logger('app')
+packet_log = get_packet_logger('app')  # per-packet diagnostics, sampled
 
 app = Flask(__name__)
 
@@ -62,14 +76,21 @@ camera_lock = threading.Lock()
 camera_active = False
 
 # -------------------Encrypt Password using Hash Func-------------------
+# Cost factor is configurable; existing hashes keep verifying since the cost is stored in each hash
+app.config['BCRYPT_LOG_ROUNDS'] = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
 bcrypt = Bcrypt(app)
+# Hashing/verification runs on a bounded worker pool instead of the request thread
+hasher = PasswordHasher(bcrypt)
 
 # -------------------Database Model Setup-------------------
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///database.db')
+# Pooling for server backends; WAL + busy timeout for SQLite so concurrent logins don't fail on locks
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'change-me-in-production')
 serializer = Serializer(app.config['SECRET_KEY'])
 db = SQLAlchemy(app)
 app.app_context().push()
+configure_engine(db.engine)
 
 
 login_manager = LoginManager()
@@ -89,7 +110,12 @@ mail = Mail(app)
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return user_cache.get(int(user_id))
+
+
+def find_user(username, email):
+    """Single lookup for the username + email pair every auth form asks for."""
+    return User.query.filter_by(username=username, email=email).first()
 
 # -------------------Database Model-------------------
 
@@ -97,43 +123,61 @@ def load_user(user_id):
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(30), nullable=False, unique=True)
-    email = db.Column(db.String(30), nullable=False)
+    email = db.Column(db.String(30), nullable=False, index=True)
     password = db.Column(db.String(80), nullable=False)
     date_created = db.Column(db.DateTime, default=datetime.utcnow)
-# ----------------------------------------------------
 
-# -------------------Welcome or Home Page-------------
 
-import os
-import glob
+# Identity cache for load_user; invalidated wherever a password or email changes
+user_cache = IdentityCache(db, User)
 
-# ... (existing imports)
+# Schema upgrades (services/database.py MIGRATIONS), then a plan/timing check of the auth lookups
+if os.environ.get('DB_AUTO_MIGRATE', 'true').lower() == 'true':
+    migrate(db)
+    check_queries(db, {
+        'find_user': db.select(User).where(User.username == '', User.email == ''),
+        'email_lookup': db.select(User.id).where(User.email == ''),
+        'load_user': db.select(User).where(User.id == 0),
+    })
+# ----------------------------------------------------
+
+# -------------------Welcome or Home Page-------------
 
 # -------------------Helper for Dynamic Background Video-------------------
+static_index = StaticAssetIndex(app.static_folder)
+
 def get_background_video():
     """
-    Scans static/videos/ for the first available video file.
+    Looks up the first available video in static/videos/ via the cached static index.
     Returns a dict with 'url' and 'timestamp' (for cache busting).
     Returns None if no video is found.
     """
-    video_dir = os.path.join(app.root_path, 'static', 'videos')
     # Support common video formats
-    video_files = glob.glob(os.path.join(video_dir, '*.mp4')) + \
-                  glob.glob(os.path.join(video_dir, '*.webm'))
+    video_files = static_index.files('videos', ('.mp4',)) + \
+                  static_index.files('videos', ('.webm',))
     
     if video_files:
         # Take the first video found
-        video_path = video_files[0]
-        video_filename = os.path.basename(video_path)
-        # Get modification time for cache busting
-        timestamp = int(os.path.getmtime(video_path))
-        
+        video = video_files[0]
         return {
-            'url': url_for('static', filename=f'videos/{video_filename}'),
-            'timestamp': timestamp
+            'url': url_for('static', filename=f"videos/{video['name']}"),
+            'timestamp': video['mtime']
         }
     return None
 
+# -------------------Static Asset Build-------------------
+# Minified, content-hashed copies in static/dist/ served as immutable; url_for('static', ...) picks them up
+asset_pipeline = AssetPipeline(app, static_index, bundles={
+    # sign_text_converter.html: one request instead of four
+    'bundles/converter.js': ['camera-controller.js', 'feature-utils.js', 'realtime-interaction.js', 'voice-sign.js'],
+})
+if asset_pipeline.enabled:
+    asset_pipeline.build()
+
+# -------------------Cached Static Pages-------------------
+# These pages only vary with the navbar's logged-in state
+page_cache = PageCache(app, vary=lambda: (bool(session.get('logged_in')), session.get('name')))
+
 # -------------------Welcome or Home Page-------------
 
 @app.route('/', methods=['GET', 'POST'])
@@ -145,6 +189,7 @@ def home():
 
 # -------------------feed back Page-----------------------
 @app.route('/feed', methods=['GET', 'POST'])
+@page_cache.cached
 def feed():
     return render_template('feed.html')
 # ----------------------------------------------------
@@ -152,6 +197,7 @@ def feed():
 
 # -------------------Discover More Page---------------
 @app.route('/discover_more', methods=['GET', 'POST']) 
+@page_cache.cached
 def discover_more():
     return render_template('discover_more.html')
 # ----------------------------------------------------
@@ -166,6 +212,7 @@ def sign_text_converter():
 
 # Voice-Sign & Sign-Voice Converter (combines Voice → Sign + Sign → Voice)
 @app.route('/voice-converter', methods=['GET'])
+@page_cache.cached
 def voice_converter():
     return render_template('voice_converter.html')
 
@@ -176,14 +223,37 @@ def sign_language():
     flash('This page has moved! Redirecting to Sign-Text & Text-Sign converter.', 'info')
     return redirect(url_for('sign_text_converter'))
 
+# MP4 rendering is CPU-bound (~1 s for a sentence); off the request thread it can't stall the gevent hub
+sign_video_pool = WorkerPool(int(os.environ.get('SIGN_VIDEO_WORKERS', 2)), 'sign_video')
+
 @app.route('/generate_sign_video_api', methods=['POST'])
 def generate_sign_video_api():
     data = request.get_json()
     text = data.get('text')
     language = data.get('language', 'ASL')
     
-    result = sign_service.generate_sign_video(text, language)
+    result = sign_video_pool.run(sign_service.generate_sign_video, text, language)
+    return jsonify(result)
+
+@app.route('/generate_sign_pose_api', methods=['POST'])
+def generate_sign_pose_api():
+    # Client-side rendering: returns the pose timeline instead of an MP4.
+    # /generate_sign_video_api stays available as the fallback path.
+    data = request.get_json()
+    text = data.get('text')
+    language = data.get('language', 'ASL')
+
+    result = sign_service.generate_pose_timeline(text, language)
     return jsonify(result)
+
+# Generated videos are garbage-collected by size/age; serving one marks it as recently used
+@app.after_request
+def track_generated_asset_access(response):
+    if request.path.startswith('/static/generated_assets/') and response.status_code in (200, 206, 304):
+        sign_service.assets.touch(os.path.basename(request.path))
+    return response
+
+sign_service.assets.start_collector()
 # ----------------------------------------------------
 
 
@@ -202,8 +272,8 @@ def login():
     if 'registered' in session and session['registered']:
         session.pop('registered', None)
     if form.validate_on_submit():
-        user = User.query.filter_by(username=form.username.data).first()
-        if user and bcrypt.check_password_hash(user.password, form.password.data) and User.query.filter_by(email=form.email.data).first():
+        user = find_user(form.username.data, form.email.data)
+        if user and hasher.check_password_hash(user.password, form.password.data):
             login_user(user)
             flash('Login successfully.', category='success')
             name = form.username.data
@@ -225,6 +295,7 @@ def dashboard():
 
 # -------------------About Page-----------------------
 @app.route('/about', methods=['GET', 'POST'])
+@page_cache.cached
 def about():
     return render_template('about.html')
 # ----------------------------------------------------
@@ -261,7 +332,7 @@ def register():
     form = RegisterForm()
 
     if form.validate_on_submit():
-        hashed_password = bcrypt.generate_password_hash(form.password.data)
+        hashed_password = hasher.generate_password_hash(form.password.data)
         new_user = User(username=form.username.data,email=form.email.data, password=hashed_password)
         db.session.add(new_user)
         db.session.commit()
@@ -290,10 +361,11 @@ def reset_email():
     form = ResetMailForm()
     if 'logged_in' in session and session['logged_in']:
         if form.validate_on_submit():
-            user = User.query.filter_by(username=form.username.data).first()
-            if user and bcrypt.check_password_hash(user.password, form.password.data) and User.query.filter_by(email=form.email.data).first():
+            user = find_user(form.username.data, form.email.data)
+            if user and hasher.check_password_hash(user.password, form.password.data):
                 user.email = form.new_email.data  # Replace old email with new email
                 db.session.commit()
+                user_cache.invalidate(user.id)
                 flash('Email reset successfully.', category='success')
                 session.clear()
                 return redirect(url_for('login'))
@@ -339,8 +411,8 @@ def reset_password_request():
     session['otp'] = otp
     form = ResetPasswordForm()
     if form.validate_on_submit():
-        user = User.query.filter_by(username=form.username.data).first()
-        if user and User.query.filter_by(email=form.email.data).first():
+        user = find_user(form.username.data, form.email.data)
+        if user:
             send_mail(form.username.data, form.email.data, otp)
             flash('Reset Request Sent. Check your mail.', 'success')
             return redirect(url_for('forgot_password'))
@@ -357,10 +429,11 @@ def forgot_password():
         valid = (otp == request.form['otp'])
 
         if valid:
-            user = User.query.filter_by(username=form.username.data).first()
-            if user and User.query.filter_by(email=form.email.data).first():
-                user.password = bcrypt.generate_password_hash(form.new_password.data).decode('utf-8')
+            user = find_user(form.username.data, form.email.data)
+            if user:
+                user.password = hasher.generate_password_hash(form.new_password.data).decode('utf-8')
                 db.session.commit()
+                user_cache.invalidate(user.id)
                 flash('Password Changed Successfully.', 'success')
                 return redirect(url_for('login'))
             else:
@@ -386,10 +459,11 @@ def update_password():
     form = UpdatePasswordForm()
     if form.validate_on_submit() and 'logged_in' in session and session['logged_in']:
 
-            user = User.query.filter_by(username=form.username.data).first()
-            if user and User.query.filter_by(email=form.email.data).first():
-                user.password = bcrypt.generate_password_hash(form.new_password.data).decode('utf-8')
+            user = find_user(form.username.data, form.email.data)
+            if user:
+                user.password = hasher.generate_password_hash(form.new_password.data).decode('utf-8')
                 db.session.commit()
+                user_cache.invalidate(user.id)
                 flash('Password Changed Successfully.', 'success')
                 session.clear()
                 return redirect(url_for('login'))
@@ -399,14 +473,35 @@ def update_password():
 # -----------------------------  end  ---------------------------
 
 
+# -------------------Pipeline Metrics-------------------
+metrics = Registry()
+udp_frames_received = metrics.counter('handsignify_udp_frames_received_total', 'JPEG frames received from the camera engine')
+udp_frame_bytes = metrics.counter('handsignify_udp_frame_bytes_total', 'Bytes of JPEG frames received from the camera engine')
+udp_predictions_received = metrics.counter('handsignify_udp_predictions_received_total', 'Predictions received from the camera engine')
+udp_errors = metrics.counter('handsignify_udp_errors_total', 'UDP listener errors', ['listener'])
+predictions_emitted = metrics.counter('handsignify_predictions_emitted_total', 'SocketIO prediction events emitted', ['event'])
+capture_to_emit = metrics.histogram('handsignify_capture_to_emit_seconds', 'Camera capture to SocketIO emit latency')
+mjpeg_viewers = metrics.gauge('handsignify_mjpeg_viewers', 'Open /video_feed streams')
+mjpeg_frames_sent = metrics.counter('handsignify_mjpeg_frames_sent_total', 'MJPEG frames written to viewers')
+socketio_clients = metrics.gauge('handsignify_socketio_clients', 'Connected SocketIO clients')
+
+# Latest metrics snapshot pushed by camera_engine.py (UDP 5557)
+engine_snapshot = None
+engine_snapshot_at = 0.0
+ENGINE_METRICS_STALE_SECONDS = 10
+
 # --------------------------- Machine Learning# -------------------Background UDP Listeners-------------------
 latest_frame_jpeg = None
+latest_frame_seq = 0
 frame_lock = threading.Lock()
+# Viewers block on this until the listener publishes a new frame (no per-viewer polling)
+frame_ready = threading.Condition(frame_lock)
+MJPEG_KEEPALIVE_SECONDS = 1.0
 
 def udp_video_listener():
     """Listens for JPEG frames from the standalone camera engine process."""
-    global latest_frame_jpeg
-    dlog("DIAGNOSTIC: UDP Video Listener Starting on 5555")
+    global latest_frame_jpeg, latest_frame_seq
+    log.info("UDP Video Listener Starting on 5555")
     
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.bind(('127.0.0.1', 5555))
@@ -416,30 +511,27 @@ def udp_video_listener():
         try:
             data, _ = sock.recvfrom(65507)
             if data:
-                dlog(f"DIAGNOSTIC: Received UDP Packet, length={len(data)}")
-                with frame_lock:
+                packet_log.debug("Received UDP Packet, length=%d", len(data))
+                udp_frames_received.inc()
+                udp_frame_bytes.inc(len(data))
+                with frame_ready:
                     latest_frame_jpeg = data
+                    latest_frame_seq += 1
+                    frame_ready.notify_all()
         except socket.timeout:
             continue
         except Exception as e:
-            dlog(f"UDP VIDEO ERROR: {e}")
-            time.sleep(1)
+            udp_errors.labels(listener='video').inc()
+            log.warning("UDP VIDEO ERROR: %s", e)
+            socketio.sleep(1)
 
 def udp_prediction_listener():
     """Listens for predictions from standalone camera engine process."""
-    dlog("DIAGNOSTIC: UDP Prediction Listener Starting on 5556")
+    log.info("UDP Prediction Listener Starting on 5556")
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.bind(('127.0.0.1', 5556))
     sock.settimeout(1.0)
     
-    labels_dict = {
-        '0': 'A', '1': 'B', '2': 'C', '3': 'D', '4': 'E', '5': 'F', '6': 'G', '7': 'H', '8': 'I', 
-        '9': 'J', '10': 'K', '11': 'L', '12': 'M', '13': 'N', '14': 'O', '15': 'P', '16': 'Q', 
-        '17': 'R', '18': 'S', '19': 'T', '20': 'U', '21': 'V', '22': 'W', '23': 'X', '24': 'Y', 
-        '25': 'Z', '26': 'Hello', '27': 'Done', '28': 'Thank You', '29': 'I Love you', 
-        '30': 'Sorry', '31': 'Please', '32': 'You are welcome.'
-    }
-    
     last_prediction = None
     stable_count = 0
     STABILITY_THRESHOLD = 5
@@ -448,15 +540,24 @@ def udp_prediction_listener():
         try:
             data, _ = sock.recvfrom(1024)
             if data:
-                predicted_label = data.decode('utf-8')
-                dlog(f"DIAGNOSTIC: Received prediction: {predicted_label}")
-                predicted_character = labels_dict.get(predicted_label, predicted_label)
+                # Payload is "<label>" or "<label>|<capture epoch seconds>"
+                predicted_label, _, captured_at = data.decode('utf-8').partition('|')
+                packet_log.debug("Received prediction: %s", predicted_label)
+                udp_predictions_received.inc()
+                predicted_character = label_to_text(predicted_label)
                 
                 # Emit to socketio
-                socketio.emit('prediction', {
+                payload = {
                     'character': predicted_character,
                     'timestamp': datetime.now().isoformat()
-                }, namespace='/')
+                }
+                if captured_at:
+                    # Engine capture time (epoch seconds) lets clients measure end-to-end latency
+                    payload['captured_at'] = float(captured_at)
+                socketio.emit('prediction', payload, namespace='/')
+                predictions_emitted.labels(event='prediction').inc()
+                if captured_at:
+                    capture_to_emit.observe(max(0.0, time.time() - float(captured_at)))
                 
                 if predicted_character == last_prediction:
                     stable_count += 1
@@ -469,47 +570,85 @@ def udp_prediction_listener():
                         'character': predicted_character,
                         'timestamp': datetime.now().isoformat()
                     }, namespace='/')
+                    predictions_emitted.labels(event='stable_prediction').inc()
                     stable_count = 0 
                 
         except socket.timeout:
             continue
         except Exception as e:
-            time.sleep(1)
+            udp_errors.labels(listener='prediction').inc()
+            log.warning("UDP PREDICTION ERROR: %s", e)
+            socketio.sleep(1)
+
+def udp_metrics_listener():
+    """Receives periodic metrics snapshots from the standalone camera engine process."""
+    global engine_snapshot, engine_snapshot_at
+    log.info("UDP Metrics Listener Starting on 5557")
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 5557))
+    sock.settimeout(1.0)
 
-# Start listeners automatically
-vid_thread = threading.Thread(target=udp_video_listener, daemon=True)
-vid_thread.start()
+    while True:
+        try:
+            data, _ = sock.recvfrom(65507)
+            if data:
+                engine_snapshot = json.loads(data.decode('utf-8'))
+                engine_snapshot_at = time.time()
+        except socket.timeout:
+            continue
+        except Exception as e:
+            udp_errors.labels(listener='metrics').inc()
+            log.warning("UDP METRICS ERROR: %s", e)
+            socketio.sleep(1)
 
-pred_thread = threading.Thread(target=udp_prediction_listener, daemon=True)
-pred_thread.start()
+# Start listeners automatically (OS threads in threading mode, greenlets under gevent/eventlet)
+vid_thread = socketio.start_background_task(udp_video_listener)
+pred_thread = socketio.start_background_task(udp_prediction_listener)
+metrics_thread = socketio.start_background_task(udp_metrics_listener)
 
 # -------------------WebSocket Event Handlers-------------------
+@socketio.on('connect')
+def handle_connect():
+    socketio_clients.inc()
+
 @socketio.on('disconnect')
 def handle_disconnect():
-    pass
+    socketio_clients.dec()
 
 # -------------------Video Frame Generation-------------------
 def generate_frames():
-    """Yield MJPEG frames from the background UDP buffer."""
-    global latest_frame_jpeg
-    
-    # Wait for the first frame
-    timeout = 100
-    while latest_frame_jpeg is None and timeout > 0:
-        time.sleep(0.05)
-        timeout -= 1
-        
-    while True:
-        with frame_lock:
-            frame_bytes = latest_frame_jpeg
-        if frame_bytes is not None:
-            yield (b'--frame\r\n'b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-        time.sleep(0.033)
+    """Yield MJPEG frames from the background UDP buffer as they arrive."""
+    mjpeg_viewers.inc()
+    try:
+        last_seq = 0
+        while True:
+            with frame_ready:
+                frame_ready.wait_for(lambda: latest_frame_seq != last_seq, timeout=MJPEG_KEEPALIVE_SECONDS)
+                frame_bytes, seq = latest_frame_jpeg, latest_frame_seq
+            # On timeout the last frame is re-sent so idle streams aren't dropped by proxies
+            last_seq = seq
+            if frame_bytes is not None:
+                yield (b'--frame\r\n'b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+                mjpeg_frames_sent.inc()
+    finally:
+        mjpeg_viewers.dec()
 
 @app.route('/video_feed')
 def video_feed():
     return Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
 
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus text exposition for app.py plus the last camera engine snapshot."""
+    body = metrics.render()
+    engine_up = engine_snapshot is not None and time.time() - engine_snapshot_at < ENGINE_METRICS_STALE_SECONDS
+    body += '# HELP handsignify_engine_up Camera engine metrics received recently\n'
+    body += '# TYPE handsignify_engine_up gauge\n'
+    body += 'handsignify_engine_up %d\n' % engine_up
+    if engine_snapshot is not None:
+        body += Registry.from_snapshot(engine_snapshot).render()
+    return Response(body, content_type=PROMETHEUS_CONTENT_TYPE)
+
 @app.route('/shutdown', methods=['POST'])
 def shutdown():
     # Only allow shutdown from localhost for security
@@ -526,10 +665,16 @@ def shutdown():
 # -----------------------------  end  ---------------------------
 
 if __name__ == '__main__':
-    print("HandSignify starting... (SocketIO async_mode=%s)" % _async_mode)
+    host = os.environ.get('HANDSIGNIFY_HOST', '127.0.0.1')
+    port = int(os.environ.get('HANDSIGNIFY_PORT', 5000))
+    log.info("HandSignify starting... (SocketIO async_mode=%s)", _async_mode)
     try:
-        socketio.run(app, debug=True, use_reloader=False, host='127.0.0.1', port=5000,
-                     allow_unsafe_werkzeug=True)  # Required by Werkzeug 3.x in development
+        if _async_mode == 'threading':
+            socketio.run(app, debug=True, use_reloader=False, host=host, port=port,
+                         allow_unsafe_werkzeug=True)  # Required by Werkzeug 3.x in development
+        else:
+            # gevent/eventlet: socketio.run serves on the async framework's own WSGI server
+            socketio.run(app, debug=False, use_reloader=False, host=host, port=port)
     except Exception as e:
         sys.stderr.write("FATAL: Server failed to start: %s\n" % e)
-        raise
\ No newline at end of file
+        raise
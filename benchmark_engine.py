@@ -0,0 +1,140 @@
+"""
+Benchmark for the recognition pipeline, runnable without a camera.
+
+Replays data/<class>/*.jpg (or any video/image path) through the same
+process_frame/encode_frame used by camera_engine.run_engine and reports
+throughput, per-stage latency percentiles and accuracy against the folder labels.
+
+    python benchmark_engine.py                       # whole data/ folder
+    python benchmark_engine.py --limit 20 --json     # 20 images per class, machine-readable
+    python benchmark_engine.py --min-fps 10 --min-accuracy 0.8   # non-zero exit on regression
+"""
+import argparse
+import json
+import sys
+import time
+
+import camera_engine
+from services.frame_sources import ReplaySource
+from services.metrics import Registry, log_linear_buckets
+
+STAGES = ('read', 'detect', 'classify', 'encode', 'total')
+PERCENTILES = (50, 90, 95, 99)
+
+
+def run_benchmark(path, fps=0, limit_per_class=None, warmup=5):
+    source = ReplaySource.from_path(path, fps=fps, limit_per_class=limit_per_class)
+    if not source.isOpened():
+        raise SystemExit(f"No frames found under {path}")
+
+    # Finer buckets than the live engine (~4% resolution) for comparable runs
+    registry = Registry()
+    stages = registry.histogram('benchmark_stage_seconds', 'Per-stage latency', ['stage'],
+                                buckets=log_linear_buckets(sub_buckets=16))
+    hands = camera_engine.create_hands()
+
+    frames = predicted_frames = labelled = correct = 0
+    confusion = {}
+    started = None
+
+    while True:
+        t0 = time.perf_counter()
+        ok, frame = source.read()
+        if not ok:
+            break
+        label = source.current_label
+
+        if warmup:
+            # MediaPipe graph initialisation dominates the first few frames
+            camera_engine.process_frame(frame, hands, stages=Registry().histogram('w', 'w', ['stage']))
+            warmup -= 1
+            continue
+        if started is None:
+            started = time.perf_counter()
+
+        stages.labels(stage='read').observe(time.perf_counter() - t0)
+        t1 = time.perf_counter()
+        predicted = camera_engine.process_frame(frame, hands, stages=stages)
+        camera_engine.encode_frame(frame, stages=stages)
+        stages.labels(stage='total').observe(time.perf_counter() - t1)
+
+        frames += 1
+        if predicted is not None:
+            predicted_frames += 1
+        if label is not None:
+            labelled += 1
+            if predicted == label:
+                correct += 1
+            elif predicted is not None:
+                key = f"{label}->{predicted}"
+                confusion[key] = confusion.get(key, 0) + 1
+
+    elapsed = time.perf_counter() - started if started else 0.0
+    source.release()
+
+    latency = {}
+    for stage in STAGES:
+        child = stages.labels(stage=stage)
+        latency[stage] = {
+            'count': child.count,
+            'mean_ms': (child.sum / child.count * 1000) if child.count else 0.0,
+            **{f'p{q}_ms': child.percentile(q) * 1000 for q in PERCENTILES},
+        }
+
+    return {
+        'source': path,
+        'frames': frames,
+        'elapsed_s': elapsed,
+        'throughput_fps': frames / elapsed if elapsed else 0.0,
+        'prediction_rate': predicted_frames / frames if frames else 0.0,
+        'accuracy': correct / labelled if labelled else None,
+        'top_confusions': dict(sorted(confusion.items(), key=lambda kv: -kv[1])[:10]),
+        'latency': latency,
+    }
+
+
+def print_report(report):
+    print(f"Source:      {report['source']}")
+    print(f"Frames:      {report['frames']} in {report['elapsed_s']:.2f}s "
+          f"({report['throughput_fps']:.1f} fps)")
+    print(f"Predicted:   {report['prediction_rate']:.1%} of frames produced a label")
+    if report['accuracy'] is not None:
+        print(f"Accuracy:    {report['accuracy']:.1%} against folder labels")
+    print()
+    header = f"{'stage':<10}{'count':>8}{'mean':>10}" + ''.join(f"{'p%d' % q:>10}" for q in PERCENTILES)
+    print(header + "   (ms)")
+    for stage, row in report['latency'].items():
+        print(f"{stage:<10}{row['count']:>8}{row['mean_ms']:>10.2f}"
+              + ''.join(f"{row[f'p{q}_ms']:>10.2f}" for q in PERCENTILES))
+    if report['top_confusions']:
+        print()
+        print("Top confusions (label->predicted):")
+        for key, count in report['top_confusions'].items():
+            print(f"  {key}: {count}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the HandSignify recognition pipeline")
+    parser.add_argument('path', nargs='?', default='data', help="image folder, class folders or video file")
+    parser.add_argument('--fps', type=float, default=0, help="replay rate; 0 = as fast as possible")
+    parser.add_argument('--limit', type=int, default=None, help="max files per class")
+    parser.add_argument('--warmup', type=int, default=5, help="frames excluded from timings")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    parser.add_argument('--min-fps', type=float, default=None, help="fail if throughput is lower")
+    parser.add_argument('--min-accuracy', type=float, default=None, help="fail if accuracy (0-1) is lower")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.path, fps=args.fps, limit_per_class=args.limit, warmup=args.warmup)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    failures = []
+    if args.min_fps is not None and report['throughput_fps'] < args.min_fps:
+        failures.append(f"throughput {report['throughput_fps']:.1f} fps < {args.min_fps}")
+    if args.min_accuracy is not None and (report['accuracy'] or 0.0) < args.min_accuracy:
+        failures.append(f"accuracy {report['accuracy'] or 0.0:.3f} < {args.min_accuracy}")
+    if failures:
+        sys.stderr.write("BENCHMARK FAILED: " + "; ".join(failures) + "\n")
+        sys.exit(1)
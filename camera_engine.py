@@ -4,6 +4,7 @@ import pickle
 import time
 import socket
 import json
+import argparse
 from datetime import datetime
 
 # Standard mediapipe imports
@@ -12,109 +13,219 @@ from mediapipe.solutions import hands as mp_hands
 from mediapipe.solutions import drawing_utils as mp_drawing
 from mediapipe.solutions import drawing_styles as mp_drawing_styles
 
+from services.diagnostics import setup_logging, get_logger, get_packet_logger
+from services.metrics import Registry
+from services.frame_sources import CameraSource, ReplaySource
+
+setup_logging('camera_engine.log')
+log = get_logger('engine')
+frame_log = get_packet_logger('engine')  # per-frame diagnostics, sampled
+
+# Per-stage metrics, pushed to app.py (UDP 5557) and served from its /metrics
+metrics = Registry()
+frames_captured = metrics.counter('handsignify_engine_frames_total', 'Frames read from the camera')
+frames_dropped = metrics.counter('handsignify_engine_frames_dropped_total', 'Frames not delivered to app.py', ['reason'])
+predictions_sent = metrics.counter('handsignify_engine_predictions_total', 'Predictions sent to app.py')
+stage_seconds = metrics.histogram('handsignify_engine_stage_seconds', 'Time spent per pipeline stage', ['stage'])
+METRICS_PUSH_INTERVAL = 1.0
+
 # Load the model
 try:
     with open('models/model.p', 'rb') as f:
         model_dict = pickle.load(f)
     model = model_dict['model']
-    print(f"Engine: Model loaded successfully. Classes: {len(model_dict.get('labels_dict', {}))}")
+    log.info("Engine: Model loaded successfully. Classes: %d", len(model_dict.get('labels_dict', {})))
 except Exception as e:
-    print(f"Engine Error loading model: {e}")
+    log.error("Engine Error loading model: %s", e)
     model = None
 
-def run_engine():
-    print("Camera Engine: Initializing CV2...")
-    # Use CAP_DSHOW for faster startup/MJPEG on Windows
-    cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    
-    if not cap.isOpened():
-        print("CRITICAL ERROR: Could not open camera.")
-        return
+def create_hands():
+    return mp_hands.Hands(static_image_mode=False, min_detection_confidence=0.3)
 
-    hands = mp_hands.Hands(static_image_mode=False, min_detection_confidence=0.3)
-    
-    # Setup UDP socket to stream JPEGs to Flask
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    flask_address = ('127.0.0.1', 5555)
+
+def process_frame(frame, hands, stages=stage_seconds):
+    """
+    Runs detection + classification on one BGR frame, drawing the landmarks and
+    prediction onto it in place. Returns the predicted label (str) or None.
+    `stages` is the histogram the per-stage timings are recorded in.
+    """
+    H, W, _ = frame.shape
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
     
-    # TCP socket for predictions
-    pred_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    pred_address = ('127.0.0.1', 5556)
-
-    print("Camera Engine Running!")
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            time.sleep(0.1)
-            continue
-            
-        H, W, _ = frame.shape
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        predicted_character = None
-        try:
+    predicted_character = None
+    try:
+        with stages.labels(stage='detect').time():
             results = hands.process(frame_rgb)
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                                              mp_drawing_styles.get_default_hand_landmarks_style(),
-                                              mp_drawing_styles.get_default_hand_connections_style())
+        if results.multi_hand_landmarks:
+            for hand_landmarks in results.multi_hand_landmarks:
+                mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
+                                          mp_drawing_styles.get_default_hand_landmarks_style(),
+                                          mp_drawing_styles.get_default_hand_connections_style())
+            
+            data_aux = []
+            x_ = []
+            y_ = []
+            
+            for i in range(len(hand_landmarks.landmark)):
+                x_.append(hand_landmarks.landmark[i].x)
+                y_.append(hand_landmarks.landmark[i].y)
                 
-                data_aux = []
-                x_ = []
-                y_ = []
+            for i in range(len(hand_landmarks.landmark)):
+                data_aux.append(hand_landmarks.landmark[i].x - min(x_))
+                data_aux.append(hand_landmarks.landmark[i].y - min(y_))
                 
-                for i in range(len(hand_landmarks.landmark)):
-                    x_.append(hand_landmarks.landmark[i].x)
-                    y_.append(hand_landmarks.landmark[i].y)
-                    
-                for i in range(len(hand_landmarks.landmark)):
-                    data_aux.append(hand_landmarks.landmark[i].x - min(x_))
-                    data_aux.append(hand_landmarks.landmark[i].y - min(y_))
-                    
-                input_data = np.asarray(data_aux).reshape(1, -1)
-                if model:
+            input_data = np.asarray(data_aux).reshape(1, -1)
+            if model:
+                with stages.labels(stage='classify').time():
                     prediction = model.predict(input_data)
-                    predicted_label = prediction[0]
-                    predicted_character = str(predicted_label)
-                    # Mapping to letter omitted for brevity, will send raw label
-                    
-                    x1 = int(min(x_) * W) - 10
-                    y1 = int(min(y_) * H) - 10
-                    x2 = int(max(x_) * W) - 10
-                    y2 = int(max(y_) * H) - 10
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 0), 4)
-                    cv2.putText(frame, predicted_character, (x1, y1 - 10),
-                                cv2.FONT_HERSHEY_SIMPLEX, 1.3, (0, 0, 0), 3, cv2.LINE_AA)
-                                
-        except Exception as e:
-            pass
-            
-        # Compress aggressively to fit in UDP packet (64KB limit)
-        encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 60]
+                predicted_label = prediction[0]
+                predicted_character = str(predicted_label)
+                # Mapping to letter omitted for brevity, will send raw label
+                
+                x1 = int(min(x_) * W) - 10
+                y1 = int(min(y_) * H) - 10
+                x2 = int(max(x_) * W) - 10
+                y2 = int(max(y_) * H) - 10
+                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 0), 4)
+                cv2.putText(frame, predicted_character, (x1, y1 - 10),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1.3, (0, 0, 0), 3, cv2.LINE_AA)
+                            
+    except Exception as e:
+        frame_log.debug("Detection failed: %s", e)
+    return predicted_character
+
+
+def encode_frame(frame, stages=stage_seconds):
+    """Returns the JPEG bytes sent to app.py, or None if encoding failed."""
+    # Compress aggressively to fit in UDP packet (64KB limit)
+    encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 60]
+    with stages.labels(stage='encode').time():
         # Resize to guarantee fit
         small_frame = cv2.resize(frame, (480, 360))
         ret_encode, buffer = cv2.imencode('.jpg', small_frame, encode_param)
-        
-        if ret_encode:
-            frame_bytes = buffer.tobytes()
-            # UDP packet size is limited to 65507 bytes.
-            if len(frame_bytes) < 65000:
-                try:
-                    sock.sendto(frame_bytes, flask_address)
-                except Exception as e:
-                    pass
+    return buffer.tobytes() if ret_encode else None
+
+
+class UdpOutput:
+    """
+    Feeds app.py: JPEG frames to UDP 5555, "<label>|<capture time>" to 5556,
+    and a metrics snapshot to 5557 every METRICS_PUSH_INTERVAL seconds.
+    """
+
+    def __init__(self, host='127.0.0.1'):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.frame_address = (host, 5555)
+        self.pred_address = (host, 5556)
+        self.metrics_address = (host, 5557)
+        self.last_push = 0.0
+
+    def start(self):
+        pass
+
+    def publish(self, frame_bytes, predicted_label, captured_at):
+        # UDP packet size is limited to 65507 bytes.
+        if len(frame_bytes) < 65000:
+            try:
+                self.sock.sendto(frame_bytes, self.frame_address)
+            except Exception as e:
+                frames_dropped.labels(reason='send_error').inc()
+                frame_log.debug("Frame send failed: %s", e)
+        else:
+            frames_dropped.labels(reason='oversize').inc()
+
+        # Send prediction if exists, stamped with capture time for latency tracking
+        if predicted_label:
+            try:
+                self.sock.sendto(f"{predicted_label}|{captured_at:.6f}".encode('utf-8'), self.pred_address)
+                predictions_sent.inc()
+            except Exception as e:
+                frame_log.debug("Prediction send failed: %s", e)
+
+        if captured_at - self.last_push >= METRICS_PUSH_INTERVAL:
+            self.last_push = captured_at
+            try:
+                self.sock.sendto(json.dumps(metrics.snapshot()).encode('utf-8'), self.metrics_address)
+            except Exception as e:
+                frame_log.debug("Metrics push failed: %s", e)
+
+    def close(self):
+        self.sock.close()
+
+
+def create_outputs(names):
+    """Builds outputs from names: 'udp' (app.py) and 'http' (MJPEG + /prediction on port 5001)."""
+    outputs = []
+    for name in names:
+        if name == 'udp':
+            outputs.append(UdpOutput())
+        elif name == 'http':
+            from camera_server import HttpOutput
+            outputs.append(HttpOutput())
+        else:
+            raise ValueError(f"Unknown output: {name}")
+    return outputs
+
+
+def run_engine(source=None, outputs=None):
+    """
+    Main loop: the camera is opened once and every frame is detected, classified
+    and encoded once, then handed to each output.
+    `source` defaults to the webcam; pass a ReplaySource to run headless.
+    `outputs` defaults to [UdpOutput()] (feeding app.py).
+    """
+    log.info("Camera Engine: Initializing CV2...")
+    cap = source or CameraSource()
+    outputs = outputs if outputs is not None else [UdpOutput()]
+    
+    if not cap.isOpened():
+        log.critical("Could not open camera.")
+        return
+
+    hands = create_hands()
+    for output in outputs:
+        output.start()
+
+    log.info("Camera Engine Running! Outputs: %s", ', '.join(type(o).__name__ for o in outputs))
+    try:
+        while not cap.finished:
+            with stage_seconds.labels(stage='capture').time():
+                ret, frame = cap.read()
+            if not ret:
+                if cap.finished:
+                    break
+                frames_dropped.labels(reason='capture_failed').inc()
+                time.sleep(0.1)
+                continue
+            captured_at = time.time()
+            frames_captured.inc()
+
+            predicted_character = process_frame(frame, hands)
+            frame_bytes = encode_frame(frame)
             
-            # Send prediction if exists
-            if predicted_character:
-                try:
-                    pred_sock.sendto(predicted_character.encode('utf-8'), pred_address)
-                except Exception:
-                    pass
-                    
-        time.sleep(0.01)
+            if frame_bytes is not None:
+                with stage_seconds.labels(stage='send').time():
+                    for output in outputs:
+                        output.publish(frame_bytes, predicted_character, captured_at)
+            else:
+                frames_dropped.labels(reason='encode_failed').inc()
+
+            stage_seconds.labels(stage='total').observe(time.time() - captured_at)
+            time.sleep(0.01)
+    finally:
+        cap.release()
+        for output in outputs:
+            output.close()
+    log.info("Camera Engine: Source finished.")
 
 if __name__ == '__main__':
-    run_engine()
+    parser = argparse.ArgumentParser(description="HandSignify camera engine")
+    parser.add_argument('--replay', metavar='PATH',
+                        help="replay a video file or an image folder (e.g. data/) instead of the webcam")
+    parser.add_argument('--fps', type=float, default=15, help="replay rate; 0 = as fast as possible")
+    parser.add_argument('--loop', action='store_true', help="restart the replay when it ends")
+    parser.add_argument('--outputs', default='udp,http',
+                        help="comma-separated: udp (frames/predictions to app.py), http (MJPEG + /prediction on 5001)")
+    args = parser.parse_args()
+
+    source = ReplaySource.from_path(args.replay, fps=args.fps, loop=args.loop) if args.replay else None
+    run_engine(source, create_outputs(args.outputs.split(',')))
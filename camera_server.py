@@ -1,84 +1,99 @@
-import cv2
-import mediapipe as mp
-import numpy as np
-import time
-from flask import Flask, Response, jsonify
+import json
+import threading
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 
-# Explicitly import mediapipe submodules
-from mediapipe.solutions import hands as mp_hands
-from mediapipe.solutions import drawing_utils as mp_drawing
-from mediapipe.solutions import drawing_styles as mp_drawing_styles
+from services.diagnostics import setup_logging, get_logger
+from services.labels import label_to_text
+
+setup_logging('camera_server.log')
+log = get_logger('camera_server')
 
 app = Flask(__name__)
 CORS(app) # Allow main app to reach us
 
-# Global state
+# Global state, written by the engine through HttpOutput
 latest_prediction = "None"
-camera_busy = False
+latest_frame_jpeg = None
+latest_frame_seq = 0
+frame_ready = threading.Condition()
+MJPEG_KEEPALIVE_SECONDS = 1.0
+
+# Prediction push state: `seq` only moves when the prediction changes or a sign becomes stable
+prediction_state = {'seq': 0, 'prediction': "None", 'stable_seq': 0, 'stable_prediction': None}
+prediction_changed = threading.Condition()
+STABLE_HOLD_SECONDS = 1.0     # same sign held this long counts as "stable" (was 5 polls at 5 Hz)
+SSE_KEEPALIVE_SECONDS = 15
+LONG_POLL_MAX_SECONDS = 25
+
+
+class HttpOutput:
+    """
+    camera_engine output serving the browser directly on port 5001:
+    /video_feed (MJPEG) and /prediction (JSON). The engine owns the camera,
+    so any number of viewers share one capture and one MediaPipe pass.
+    """
+
+    def __init__(self, host='127.0.0.1', port=5001):
+        self.host = host
+        self.port = port
+        self._held_since = None
+
+    def start(self):
+        thread = threading.Thread(target=self._serve, daemon=True)
+        thread.start()
+
+    def _serve(self):
+        log.info("Camera Engine Server Starting on Port %d...", self.port)
+        # NOTE: We use threaded=True so multiple browser instances don't block each other
+        app.run(host=self.host, port=self.port, threaded=True, debug=False, use_reloader=False)
+
+    def publish(self, frame_bytes, predicted_label, captured_at):
+        global latest_prediction, latest_frame_jpeg, latest_frame_seq
+        prediction = label_to_text(predicted_label) if predicted_label else "None"
+        self._update_prediction(prediction, captured_at)
+        latest_prediction = prediction
+        with frame_ready:
+            latest_frame_jpeg = frame_bytes
+            latest_frame_seq += 1
+            frame_ready.notify_all()
+
+    def _update_prediction(self, prediction, now):
+        with prediction_changed:
+            changed = prediction != prediction_state['prediction']
+            if changed:
+                prediction_state['prediction'] = prediction
+                self._held_since = now
+            elif prediction != "None" and now - self._held_since >= STABLE_HOLD_SECONDS:
+                prediction_state['stable_seq'] += 1
+                prediction_state['stable_prediction'] = prediction
+                self._held_since = now  # Reset after accumulation
+                changed = True
+            if changed:
+                prediction_state['seq'] += 1
+                prediction_changed.notify_all()
+
+    def close(self):
+        pass
+
+
+def wait_for_prediction(since, timeout):
+    """Blocks until prediction_state['seq'] != since (or timeout); returns a copy of the state."""
+    with prediction_changed:
+        prediction_changed.wait_for(lambda: prediction_state['seq'] != since, timeout=timeout)
+        return dict(prediction_state)
 
-def get_camera():
-    # Use CAP_DSHOW for fastest startup on Windows
-    cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    return cap
 
 def generate_frames():
-    global latest_prediction, camera_busy
-    
-    if camera_busy:
-        return
-    camera_busy = True
-
-    try:
-        cap = get_camera()
-        if not cap.isOpened():
-            yield b"Error: Could not open camera."
-            return
-
-        # MediaPipe Hands setup
-        with mp_hands.Hands(
-            model_complexity=0,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5) as hands:
-
-            while True:
-                success, frame = cap.read()
-                if not success:
-                    break
-
-                # Process MediaPipe
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = hands.process(frame_rgb)
-
-                prediction = "None"
-                if results.multi_hand_landmarks:
-                    prediction = "Hand Detected" # Replace with actual model prediction if available
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        mp_drawing.draw_landmarks(
-                            frame,
-                            hand_landmarks,
-                            mp_hands.HAND_CONNECTIONS,
-                            mp_drawing_styles.get_default_hand_landmarks_style(),
-                            mp_drawing_styles.get_default_hand_connections_style())
-                
-                latest_prediction = prediction
-
-                # Encode frame
-                ret, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 60])
-                frame_bytes = buffer.tobytes()
-                
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-                
-                # Small sleep to yield CPU
-                time.sleep(0.01)
-
-    finally:
-        if 'cap' in locals():
-            cap.release()
-        camera_busy = False
+    last_seq = 0
+    while True:
+        with frame_ready:
+            frame_ready.wait_for(lambda: latest_frame_seq != last_seq, timeout=MJPEG_KEEPALIVE_SECONDS)
+            frame_bytes, seq = latest_frame_jpeg, latest_frame_seq
+        last_seq = seq
+        if frame_bytes is not None:
+            yield (b'--frame\r\n'
+                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
 
 @app.route('/video_feed')
 def video_feed():
@@ -86,9 +101,30 @@ def video_feed():
 
 @app.route('/prediction')
 def get_prediction():
-    return jsonify({'prediction': latest_prediction})
+    # Compatibility: plain GET returns immediately, as the old poller expects.
+    # Long-poll fallback: /prediction?since=<seq> waits until something changes.
+    since = request.args.get('since', type=int)
+    if since is None:
+        return jsonify({'prediction': latest_prediction})
+    timeout = min(request.args.get('timeout', LONG_POLL_MAX_SECONDS, type=float), LONG_POLL_MAX_SECONDS)
+    return jsonify(wait_for_prediction(since, timeout))
+
+@app.route('/prediction/stream')
+def prediction_stream():
+    """Server-Sent Events: one 'prediction' event per change, comment pings to keep proxies open."""
+    def events():
+        since = -1  # Send the current state immediately
+        while True:
+            state = wait_for_prediction(since, SSE_KEEPALIVE_SECONDS)
+            if state['seq'] == since:
+                yield ': ping\n\n'
+                continue
+            since = state['seq']
+            yield 'event: prediction\nid: %d\ndata: %s\n\n' % (since, json.dumps(state))
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 if __name__ == '__main__':
-    print("Camera Engine Server Starting on Port 5001...")
-    # NOTE: We use threaded=True so multiple browser instances don't block each other
-    app.run(host='127.0.0.1', port=5001, threaded=True, debug=False)
+    # Same as `python camera_engine.py`: one capture loop feeding both app.py (UDP) and this HTTP server
+    import camera_engine
+    camera_engine.run_engine(outputs=[camera_engine.UdpOutput(), HttpOutput()])
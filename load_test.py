@@ -0,0 +1,282 @@
+"""
+Load generator for app.py.
+
+Plays a fake camera engine (JPEG frames to UDP 5555, labels to UDP 5556) and
+opens N simulated /video_feed viewers and M SocketIO clients, then reports
+frame delivery rate per viewer, prediction emit latency and server CPU/memory.
+
+    python app.py                                   # in another terminal
+    python load_test.py --viewers 20 --sio-clients 50 --duration 30
+    python load_test.py --viewers 100 --server-pid 12345 --json
+
+Use --no-engine when a real camera_engine.py is already feeding the server.
+Server CPU/memory needs --server-pid (psutil is used when installed, /proc otherwise).
+"""
+import argparse
+import glob
+import json
+import os
+import socket
+import threading
+import time
+
+import requests
+
+from services.metrics import Registry
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PERCENTILES = (50, 90, 99)
+
+
+# ------------------- Fake camera engine -------------------
+def load_frames(data_dir='data', count=30):
+    """A few real JPEGs, re-encoded the way camera_engine.encode_frame does."""
+    import cv2
+    frames = []
+    for path in sorted(glob.glob(os.path.join(data_dir, '*', '*.jpg')))[:count]:
+        img = cv2.imread(path)
+        if img is None:
+            continue
+        ok, buf = cv2.imencode('.jpg', cv2.resize(img, (480, 360)), [int(cv2.IMWRITE_JPEG_QUALITY), 60])
+        if ok and len(buf) < 65000:
+            frames.append(buf.tobytes())
+    if not frames:
+        raise SystemExit(f"No frames found under {data_dir}/<class>/*.jpg")
+    return frames
+
+
+class FakeEngine(threading.Thread):
+    def __init__(self, stop, frames, frame_fps, pred_fps, labels=('0', '1', '2')):
+        super().__init__(daemon=True)
+        self.stop = stop
+        self.frames = frames
+        self.frame_fps = frame_fps
+        self.pred_fps = pred_fps
+        self.labels = labels
+        self.frames_sent = 0
+        self.predictions_sent = 0
+
+    def run(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        start = time.perf_counter()
+        next_frame = start if self.frame_fps else float('inf')
+        next_pred = start if self.pred_fps else float('inf')
+        if not (self.frame_fps or self.pred_fps):
+            return
+        while not self.stop.is_set():
+            now = time.perf_counter()
+            if self.frame_fps and now >= next_frame:
+                sock.sendto(self.frames[self.frames_sent % len(self.frames)], ('127.0.0.1', 5555))
+                self.frames_sent += 1
+                next_frame += 1.0 / self.frame_fps
+            if self.pred_fps and now >= next_pred:
+                # Hold each label for 8 predictions so stable_prediction fires too
+                label = self.labels[(self.predictions_sent // 8) % len(self.labels)]
+                sock.sendto(f"{label}|{time.time():.6f}".encode('utf-8'), ('127.0.0.1', 5556))
+                self.predictions_sent += 1
+                next_pred += 1.0 / self.pred_fps
+            time.sleep(max(0.0, min(next_frame, next_pred) - time.perf_counter()))
+
+
+# ------------------- Simulated clients -------------------
+class MjpegViewer(threading.Thread):
+    def __init__(self, stop, url):
+        super().__init__(daemon=True)
+        self.stop = stop
+        self.url = url
+        self.frames = 0
+        self.bytes = 0
+        self.first_frame_s = None
+        self.error = None
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            with requests.get(self.url, stream=True, timeout=(5, 10)) as response:
+                tail = b''
+                for chunk in response.iter_content(chunk_size=16 * 1024):
+                    if self.stop.is_set():
+                        break
+                    self.bytes += len(chunk)
+                    # Keep a few bytes so a boundary split across chunks is still counted once
+                    window = tail + chunk
+                    boundaries = window.count(b'--frame')
+                    tail = window[-6:]
+                    if boundaries and self.first_frame_s is None:
+                        self.first_frame_s = time.perf_counter() - started
+                    self.frames += boundaries
+        except Exception as e:
+            self.error = str(e)
+
+
+class SocketIOViewer:
+    def __init__(self, url, latency):
+        import socketio
+        self.url = url
+        self.latency = latency
+        self.events = {'prediction': 0, 'stable_prediction': 0}
+        self.error = None
+        self.client = socketio.Client(reconnection=False)
+        self.client.on('prediction', self._on_prediction)
+        self.client.on('stable_prediction', self._on_stable)
+
+    def _on_prediction(self, data):
+        self.events['prediction'] += 1
+        if 'captured_at' in data:
+            self.latency.observe(max(0.0, time.time() - data['captured_at']))
+
+    def _on_stable(self, data):
+        self.events['stable_prediction'] += 1
+
+    def connect(self):
+        try:
+            self.client.connect(self.url, wait_timeout=10)
+        except Exception as e:
+            self.error = str(e)
+
+    def disconnect(self):
+        if self.client.connected:
+            self.client.disconnect()
+
+
+# ------------------- Server resource sampling -------------------
+class ResourceSampler(threading.Thread):
+    def __init__(self, stop, pid, interval=1.0):
+        super().__init__(daemon=True)
+        self.stop = stop
+        self.pid = pid
+        self.interval = interval
+        self.cpu = []
+        self.rss_mb = []
+
+    def run(self):
+        if psutil is not None:
+            proc = psutil.Process(self.pid)
+            proc.cpu_percent(None)
+            while not self.stop.wait(self.interval):
+                self.cpu.append(proc.cpu_percent(None))
+                self.rss_mb.append(proc.memory_info().rss / 1e6)
+            return
+
+        # Linux fallback without psutil
+        ticks = os.sysconf('SC_CLK_TCK')
+        page = os.sysconf('SC_PAGE_SIZE')
+        last_cpu, last_t = self._proc_cpu(), time.perf_counter()
+        while not self.stop.wait(self.interval):
+            cpu, t = self._proc_cpu(), time.perf_counter()
+            self.cpu.append(100.0 * (cpu - last_cpu) / ticks / (t - last_t))
+            last_cpu, last_t = cpu, t
+            with open(f'/proc/{self.pid}/statm') as f:
+                self.rss_mb.append(int(f.read().split()[1]) * page / 1e6)
+
+    def _proc_cpu(self):
+        with open(f'/proc/{self.pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return int(fields[11]) + int(fields[12])  # utime + stime
+
+
+# ------------------- Run -------------------
+def run_load_test(url, viewers, sio_clients, duration, frame_fps, pred_fps, engine=True, server_pid=None):
+    stop = threading.Event()
+    latency = Registry().histogram('emit_latency_seconds', 'Capture to client receive')
+
+    fake = None
+    if engine:
+        fake = FakeEngine(stop, load_frames(), frame_fps, pred_fps)
+        fake.start()
+
+    sampler = None
+    if server_pid:
+        sampler = ResourceSampler(stop, server_pid)
+        sampler.start()
+
+    sio = [SocketIOViewer(url, latency) for _ in range(sio_clients)]
+    for client in sio:
+        client.connect()
+
+    mjpeg = [MjpegViewer(stop, url.rstrip('/') + '/video_feed') for _ in range(viewers)]
+    for viewer in mjpeg:
+        viewer.start()
+
+    started = time.perf_counter()
+    time.sleep(duration)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for client in sio:
+        client.disconnect()
+
+    rates = [v.frames / elapsed for v in mjpeg if v.error is None]
+    report = {
+        'url': url,
+        'duration_s': elapsed,
+        'engine': {
+            'frames_sent': fake.frames_sent if fake else None,
+            'predictions_sent': fake.predictions_sent if fake else None,
+        },
+        'mjpeg': {
+            'viewers': viewers,
+            'failed': sum(1 for v in mjpeg if v.error is not None),
+            'fps_mean': sum(rates) / len(rates) if rates else 0.0,
+            'fps_min': min(rates) if rates else 0.0,
+            'mbit_per_s_total': sum(v.bytes for v in mjpeg) * 8 / 1e6 / elapsed,
+            'first_frame_s_max': max((v.first_frame_s for v in mjpeg if v.first_frame_s), default=None),
+        },
+        'socketio': {
+            'clients': sio_clients,
+            'failed': sum(1 for c in sio if c.error is not None),
+            'predictions_per_client_per_s': (sum(c.events['prediction'] for c in sio) / max(1, len(sio)) / elapsed),
+            'stable_predictions_total': sum(c.events['stable_prediction'] for c in sio),
+            'emit_latency_ms': {f'p{q}': latency.percentile(q) * 1000 for q in PERCENTILES},
+        },
+        'server': None,
+    }
+    if sampler and sampler.cpu:
+        report['server'] = {
+            'cpu_percent_mean': sum(sampler.cpu) / len(sampler.cpu),
+            'cpu_percent_max': max(sampler.cpu),
+            'rss_mb_max': max(sampler.rss_mb),
+        }
+    return report
+
+
+def print_report(report):
+    m, s, e = report['mjpeg'], report['socketio'], report['engine']
+    print(f"Target:        {report['url']} for {report['duration_s']:.1f}s")
+    if e['frames_sent'] is not None:
+        print(f"Fake engine:   {e['frames_sent']} frames, {e['predictions_sent']} predictions sent")
+    print(f"MJPEG:         {m['viewers']} viewers ({m['failed']} failed), "
+          f"{m['fps_mean']:.1f} fps mean / {m['fps_min']:.1f} min, {m['mbit_per_s_total']:.1f} Mbit/s total")
+    print(f"SocketIO:      {s['clients']} clients ({s['failed']} failed), "
+          f"{s['predictions_per_client_per_s']:.1f} predictions/s per client, "
+          f"{s['stable_predictions_total']} stable")
+    print("Emit latency:  " + ", ".join(f"{k} {v:.1f}ms" for k, v in s['emit_latency_ms'].items()))
+    if report['server']:
+        srv = report['server']
+        print(f"Server:        CPU {srv['cpu_percent_mean']:.0f}% mean / {srv['cpu_percent_max']:.0f}% max, "
+              f"RSS {srv['rss_mb_max']:.0f} MB max")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load test the HandSignify server")
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--viewers', type=int, default=10, help="concurrent /video_feed streams")
+    parser.add_argument('--sio-clients', type=int, default=10, help="concurrent SocketIO clients")
+    parser.add_argument('--duration', type=float, default=20, help="seconds to hold the load")
+    parser.add_argument('--frame-fps', type=float, default=30, help="fake engine frame rate")
+    parser.add_argument('--pred-fps', type=float, default=10, help="fake engine prediction rate")
+    parser.add_argument('--no-engine', action='store_true', help="don't send fake engine traffic")
+    parser.add_argument('--server-pid', type=int, default=None, help="sample CPU/memory of this process")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = run_load_test(args.url, args.viewers, args.sio_clients, args.duration,
+                           args.frame_fps, args.pred_fps, engine=not args.no_engine,
+                           server_pid=args.server_pid)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
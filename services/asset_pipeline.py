@@ -0,0 +1,227 @@
+"""
+Build step for static JS/CSS, run by app.py on start.
+
+- Every .js/.css under static/ (and each bundle in `bundles`) is minified and written
+  to static/dist/ under a content-hashed name, plus .gz/.br variants when smaller
+- url_for('static', filename='premium_ui.css') resolves to the hashed file; other
+  static files (images, videos) get a ?v=<content hash> query instead
+- Hashed and versioned URLs are served with `Cache-Control: immutable`, the
+  precompressed variant picked from Accept-Encoding
+
+A bundle is a logical file that only exists in dist/, e.g. 'bundles/converter.js'
+built from several sources in order. With the pipeline disabled, bundles are
+concatenated on each request and nothing is cached, which is handier while editing.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+
+from flask import Response, request, send_from_directory
+
+# Optional: real minifiers when installed. Without them CSS is stripped of comments/whitespace
+# and JS is left as is (a regex can't safely minify JS; gzip/brotli still apply)
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+class AssetPipeline:
+    def __init__(self, app, static_index, bundles=None, out_dir='dist', enabled=None,
+                 skip_dirs=('dist', 'generated_assets')):
+        self.app = app
+        self.static_index = static_index
+        self.bundles = bundles or {}
+        self.out_dir = out_dir
+        self.skip_dirs = tuple(skip_dirs)
+        if enabled is None:
+            enabled = os.environ.get('ASSET_PIPELINE_ENABLED', 'true').lower() == 'true'
+        self.enabled = enabled
+        self.manifest = {}   # logical name -> dist/<name>.<hash>.<ext>
+        self._versions = {}  # filename -> (mtime, size, hash) for files outside the manifest
+        self._lock = threading.Lock()
+
+        app.url_defaults(self._hashed_url)
+        app.view_functions['static'] = self.send_static
+
+    # ------------------- Build -------------------
+    def build(self):
+        """Writes dist/ and manifest.json; stale outputs from earlier builds are removed."""
+        root = self.app.static_folder
+        dist = os.path.join(root, self.out_dir)
+        manifest = {}
+        for name in self._sources():
+            with open(os.path.join(root, name), 'rb') as f:
+                manifest[name] = self._emit(dist, name, self._minify(name, f.read()))
+        for name, sources in self.bundles.items():
+            manifest[name] = self._emit(dist, name, self._minify(name, self._concat(name, sources)))
+
+        keep = {'manifest.json'}
+        for hashed in manifest.values():
+            rel = posixpath.relpath(hashed, self.out_dir)
+            keep.update([rel, rel + '.gz', rel + '.br'])
+        for folder, _, files in os.walk(dist):
+            for filename in files:
+                rel = os.path.relpath(os.path.join(folder, filename), dist).replace(os.sep, '/')
+                if rel not in keep:
+                    os.remove(os.path.join(folder, filename))
+
+        _write_atomic(os.path.join(dist, 'manifest.json'), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+        with self._lock:
+            self.manifest = manifest
+        return manifest
+
+    def _sources(self):
+        root = self.app.static_folder
+        for folder, dirs, files in os.walk(root):
+            rel_dir = os.path.relpath(folder, root).replace(os.sep, '/')
+            if rel_dir == '.':
+                dirs[:] = [d for d in dirs if d not in self.skip_dirs]
+                rel_dir = ''
+            for filename in sorted(files):
+                if filename.endswith(('.js', '.css')):
+                    yield posixpath.join(rel_dir, filename)
+
+    def _concat(self, name, sources):
+        root = self.app.static_folder
+        parts = []
+        for source in sources:
+            with open(os.path.join(root, source), 'rb') as f:
+                body = f.read()
+            if name.endswith('.css'):
+                body = _absolute_css_urls(body, source)
+            parts.append(body.rstrip())
+        # ';' guards against a file that ends without one before the next IIFE
+        return (b'\n;\n' if name.endswith('.js') else b'\n').join(parts) + b'\n'
+
+    def _minify(self, name, body):
+        text = body.decode('utf-8')
+        if name.endswith('.css'):
+            # dist/ sits elsewhere, so relative url()s are made absolute first
+            text = _absolute_css_urls(body, name).decode('utf-8')
+            text = rcssmin.cssmin(text) if rcssmin else _strip_css(text)
+        elif rjsmin:
+            text = rjsmin.jsmin(text)
+        return text.encode('utf-8')
+
+    def _emit(self, dist, name, body):
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        stem, ext = posixpath.splitext(name)
+        hashed = posixpath.join(self.out_dir, '%s.%s%s' % (stem, digest, ext))
+        path = os.path.join(self.app.static_folder, hashed)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write_atomic(path, body)
+            # mtime=0 keeps the .gz byte-identical across builds
+            variants = [('.gz', gzip.compress(body, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                variants.append(('.br', brotli.compress(body)))
+            for suffix, compressed in variants:
+                if len(compressed) < len(body):
+                    _write_atomic(path + suffix, compressed)
+        return hashed
+
+    # ------------------- url_for -------------------
+    def _hashed_url(self, endpoint, values):
+        if endpoint != 'static' or 'filename' not in values:
+            return
+        filename = values['filename']
+        if not self.enabled:
+            return
+        with self._lock:
+            hashed = self.manifest.get(filename)
+        if hashed:
+            values['filename'] = hashed
+        elif 'v' not in values:
+            version = self._version(filename)
+            if version:
+                values['v'] = version
+
+    def _version(self, filename):
+        subdir, name = posixpath.split(filename)
+        info = self.static_index.get(subdir, name)
+        if info is None:
+            return None
+        with self._lock:
+            cached = self._versions.get(filename)
+        if cached and cached[:2] == (info['mtime'], info['size']):
+            return cached[2]
+        sha = hashlib.sha256()
+        with open(info['path'], 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        version = sha.hexdigest()[:12]
+        with self._lock:
+            self._versions[filename] = (info['mtime'], info['size'], version)
+        return version
+
+    # ------------------- Serving -------------------
+    def send_static(self, filename):
+        if filename in self.bundles and not self.manifest:
+            body = self._concat(filename, self.bundles[filename])
+            return Response(body, mimetype=mimetypes.guess_type(filename)[0],
+                            headers={'Cache-Control': 'no-cache'})
+
+        if not filename.startswith(self.out_dir + '/'):
+            response = self.app.send_static_file(filename)
+            if request.args.get('v'):
+                response.headers['Cache-Control'] = IMMUTABLE
+            return response
+
+        accepted = request.headers.get('Accept-Encoding', '')
+        path = filename
+        encoding = None
+        for name, suffix in ENCODINGS:
+            if name in accepted and os.path.isfile(os.path.join(self.app.static_folder, filename + suffix)):
+                path, encoding = filename + suffix, name
+                break
+        response = send_from_directory(self.app.static_folder, path,
+                                       mimetype=mimetypes.guess_type(filename)[0], max_age=31536000)
+        response.headers['Cache-Control'] = IMMUTABLE
+        response.headers['Vary'] = 'Accept-Encoding'
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+
+def _absolute_css_urls(body, source):
+    base = posixpath.dirname(source)
+
+    def rewrite(match):
+        url = match.group(2).strip()
+        if url.startswith(('data:', 'http:', 'https:', '//', '/', '#')):
+            return match.group(0)
+        return 'url(%s/static/%s%s)' % (match.group(1), posixpath.normpath(posixpath.join(base, url)), match.group(1))
+
+    return CSS_URL.sub(rewrite, body.decode('utf-8')).encode('utf-8')
+
+
+def _strip_css(text):
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    return text.replace(';}', '}').strip() + '\n'
+
+
+def _write_atomic(path, body):
+    temp = path + '.tmp'
+    with open(temp, 'wb') as f:
+        f.write(body)
+    os.replace(temp, path)
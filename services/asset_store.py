@@ -0,0 +1,160 @@
+import os
+import time
+import threading
+
+from services.diagnostics import get_logger
+
+log = get_logger('assets')
+
+
+class GeneratedAssetStore:
+    """
+    Disk-usage manager for static/generated_assets.
+    - Size and age quotas, enforced by a background collector thread
+    - Access tracking so recently served files are evicted last (and never inside the grace window)
+    - Temp-then-rename helpers so a half-written video is never served
+    Only files whose names start with one of `managed_prefixes` are ever removed,
+    and never those listed in the directory's `.keep` file (checked-in sample clips).
+    """
+
+    TEMP_PREFIX = ".tmp_"
+    TEMP_SUFFIX = ".part"
+    KEEP_FILE = ".keep"
+
+    def __init__(self, directory, managed_prefixes=("ai_", "skeletal_"),
+                 max_bytes=None, max_age=None, grace_period=None, interval=None):
+        self.directory = directory
+        self.managed_prefixes = tuple(managed_prefixes)
+        self.max_bytes = max_bytes or int(os.environ.get("ASSET_MAX_MB", 500)) * 1024 * 1024
+        self.max_age = max_age or float(os.environ.get("ASSET_MAX_AGE_HOURS", 24)) * 3600
+        self.grace_period = grace_period or float(os.environ.get("ASSET_GRACE_SECONDS", 600))
+        self.interval = interval or float(os.environ.get("ASSET_GC_INTERVAL_SECONDS", 300))
+        # Abandoned temp files (crashed writer) are removed after this long
+        self.temp_timeout = 600
+
+        self._last_access = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        os.makedirs(self.directory, exist_ok=True)
+        self.keep = self._read_keep_file()
+
+    # ------------------- Writing -------------------
+    def temp_path_for(self, filename):
+        # Keep the real extension last: cv2.VideoWriter picks the container from it
+        return os.path.join(self.directory, self.TEMP_PREFIX + filename)
+
+    def commit(self, temp_path, filename):
+        """Atomically publishes a finished temp file under its final name."""
+        final_path = os.path.join(self.directory, filename)
+        os.replace(temp_path, final_path)
+        self.touch(filename)
+        return final_path
+
+    def discard(self, temp_path):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    # ------------------- Access tracking -------------------
+    def touch(self, filename):
+        with self._lock:
+            self._last_access[filename] = time.time()
+
+    def _is_managed(self, filename):
+        return filename.startswith(self.managed_prefixes) and filename not in self.keep
+
+    def _read_keep_file(self):
+        try:
+            with open(os.path.join(self.directory, self.KEEP_FILE)) as f:
+                return {line.strip() for line in f if line.strip() and not line.startswith('#')}
+        except FileNotFoundError:
+            return set()
+
+    def _is_temp(self, filename):
+        return filename.startswith(self.TEMP_PREFIX) or filename.endswith(self.TEMP_SUFFIX)
+
+    # ------------------- Collection -------------------
+    def collect(self):
+        """Runs one collection pass. Returns (files_removed, bytes_freed)."""
+        now = time.time()
+        removed, freed = 0, 0
+        removed_names = []
+        candidates = []
+        total = 0
+
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return removed, freed
+
+        with self._lock:
+            last_access = dict(self._last_access)
+
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            if self._is_temp(entry.name):
+                if now - st.st_mtime > self.temp_timeout and self._remove(entry.path):
+                    removed, freed = removed + 1, freed + st.st_size
+                    removed_names.append(entry.name)
+                continue
+
+            total += st.st_size
+            if not self._is_managed(entry.name):
+                continue
+
+            used = max(st.st_mtime, last_access.get(entry.name, 0))
+            if now - used > self.max_age:
+                if self._remove(entry.path):
+                    removed, freed, total = removed + 1, freed + st.st_size, total - st.st_size
+                    removed_names.append(entry.name)
+            elif now - used > self.grace_period:
+                candidates.append((used, entry.name, entry.path, st.st_size))
+
+        # Over quota: evict least recently used first
+        candidates.sort()
+        for _, name, path, size in candidates:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                removed, freed, total = removed + 1, freed + size, total - size
+                removed_names.append(name)
+
+        with self._lock:
+            present = {e.name for e in entries}
+            for name in list(self._last_access):
+                if name not in present:
+                    del self._last_access[name]
+
+        if removed:
+            log.info("Asset collector removed %d file(s), %.1f MB: %s",
+                     removed, freed / (1024 * 1024), ', '.join(removed_names))
+        return removed, freed
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            with self._lock:
+                self._last_access.pop(os.path.basename(path), None)
+            return True
+        except OSError:
+            # Still open on Windows (being served) or already gone
+            return False
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.collect()
+            except Exception:
+                log.warning("Asset collection pass failed", exc_info=True)
+
+    def start_collector(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self._thread
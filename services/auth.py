@@ -0,0 +1,64 @@
+import os
+import threading
+import time
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from services.worker_pool import WorkerPool
+
+
+class PasswordHasher:
+    """
+    Runs Flask-Bcrypt hashing/verification on a small dedicated WorkerPool.
+    The pool size caps how many cores a login burst can take, leaving the rest
+    for page rendering, and under gevent bcrypt never blocks the event loop.
+    Method names match Flask-Bcrypt, so it is a drop-in for `bcrypt.*` calls.
+    """
+
+    def __init__(self, bcrypt, workers=None):
+        self.bcrypt = bcrypt
+        self.workers = workers or int(os.environ.get('BCRYPT_WORKERS', 2))
+        self._pool = WorkerPool(self.workers, 'bcrypt')
+
+    def generate_password_hash(self, password):
+        return self._pool.run(self.bcrypt.generate_password_hash, password)
+
+    def check_password_hash(self, pw_hash, password):
+        return self._pool.run(self.bcrypt.check_password_hash, pw_hash, password)
+
+
+class IdentityCache:
+    """
+    Short-TTL cache for Flask-Login's user_loader.
+    Stores column values, not ORM instances, and re-attaches a copy to the
+    current session with merge(load=False), so a hit costs no SELECT.
+    Call `invalidate(user_id)` after changing a user's password or email.
+    """
+
+    def __init__(self, db, model, ttl=None):
+        self.db = db
+        self.model = model
+        self.ttl = ttl if ttl is not None else float(os.environ.get('USER_CACHE_TTL', 60))
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._columns = [c.key for c in model.__table__.columns]
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry and now - entry[0] < self.ttl:
+            user = self.model(**entry[1])
+            make_transient_to_detached(user)
+            return self.db.session.merge(user, load=False)
+
+        user = self.db.session.get(self.model, user_id)
+        if user is not None:
+            values = {c: getattr(user, c) for c in self._columns}
+            with self._lock:
+                self._entries[user_id] = (now, values)
+        return user
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
@@ -0,0 +1,124 @@
+"""
+Database tuning and schema upgrades for app.py.
+
+- engine_options(uri): pool settings for server backends (DATABASE_URL), busy timeout for SQLite
+- configure_engine(engine): WAL + busy_timeout pragmas on every SQLite connection, slow query logging
+- migrate(db): creates missing tables, then applies MIGRATIONS not yet recorded in `schema_version`
+- check_queries(db, queries): times the hot queries at startup; on SQLite also flags full table scans
+
+Anything touching model tables goes through SQLAlchemy constructs rather than raw SQL,
+so identifier quoting is right on every DATABASE_URL backend (`user` needs backticks
+on MySQL, double quotes elsewhere).
+"""
+import os
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+
+from services.diagnostics import get_logger
+
+log = get_logger('database')
+
+SLOW_QUERY_SECONDS = float(os.environ.get('DB_SLOW_QUERY_MS', 100)) / 1000
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))
+
+
+def engine_options(uri):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured backend."""
+    url = make_url(uri)
+    if url.get_backend_name() == 'sqlite':
+        # Python-level lock wait, matching the busy_timeout pragma set on connect
+        return {'connect_args': {'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000}}
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        # Recycle before typical server-side idle timeouts (MySQL wait_timeout, proxies)
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': True,
+    }
+
+
+def configure_engine(engine):
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', _sqlite_pragmas)
+    event.listen(engine, 'before_cursor_execute', _start_timer)
+    event.listen(engine, 'after_cursor_execute', _log_slow_query)
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # WAL: readers never block the writer and vice versa; only writers queue on each other
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA busy_timeout=%d' % SQLITE_BUSY_TIMEOUT_MS)
+    # Safe with WAL (a crash can lose the last commits, never corrupt the file) and far fewer fsyncs
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.close()
+
+
+# The start time lives on the per-statement execution context, not conn.info: after_cursor_execute
+# doesn't fire for a statement that raises, and a stack on a pooled connection would keep its entry
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    if elapsed >= SLOW_QUERY_SECONDS:
+        log.warning("Slow query (%.0f ms): %s", elapsed * 1000, ' '.join(statement.split()))
+
+
+# ------------------- Migrations -------------------
+def _create_index(connection, metadata, table, name):
+    """Creates an index declared on the model (index=True) that predates it in an existing database."""
+    index = next(ix for ix in metadata.tables[table].indexes if ix.name == name)
+    index.create(connection, checkfirst=True)
+
+
+def _add_user_email_index(connection, metadata):
+    # Every auth route filters on email; username is already covered by its UNIQUE index
+    _create_index(connection, metadata, 'user', 'ix_user_email')
+
+
+# (version, description, function(connection, metadata)); append only, never renumber
+MIGRATIONS = [
+    (1, 'index user.email', _add_user_email_index),
+]
+
+
+def migrate(db):
+    """Brings the schema up to date. Safe to run on every start."""
+    db.create_all()
+    with db.engine.begin() as connection:
+        connection.execute(text('CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)'))
+        current = connection.execute(text('SELECT MAX(version) FROM schema_version')).scalar() or 0
+        for version, description, apply in MIGRATIONS:
+            if version <= current:
+                continue
+            log.info("Applying migration %d: %s", version, description)
+            apply(connection, db.metadata)
+            connection.execute(text('INSERT INTO schema_version (version) VALUES (:v)'), {'v': version})
+
+
+def check_queries(db, queries):
+    """
+    Runs each named select() once and logs its time; on SQLite also logs the
+    query plan and warns when it scans a table instead of using an index.
+    """
+    sqlite = db.engine.dialect.name == 'sqlite'
+    with db.engine.connect() as connection:
+        for name, statement in queries.items():
+            started = time.perf_counter()
+            connection.execute(statement).fetchall()
+            elapsed = time.perf_counter() - started
+
+            scans = []
+            if sqlite:
+                sql = statement.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True})
+                plan = [row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN %s' % sql)]
+                scans = [step for step in plan if step.startswith('SCAN')]
+            if scans or elapsed >= SLOW_QUERY_SECONDS:
+                log.warning("Query check %s: %.1f ms %s", name, elapsed * 1000, '; '.join(scans))
+            else:
+                log.info("Query check %s: %.1f ms", name, elapsed * 1000)
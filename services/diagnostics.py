@@ -0,0 +1,103 @@
+"""
+Shared logging setup for app.py, camera_engine.py and camera_server.py.
+
+Records are put on an in-memory queue and written by a single background
+QueueListener thread, so request and capture threads never touch the disk.
+The log file rotates by size. High-rate diagnostics (one per UDP packet or
+video frame) go through `get_packet_logger`, which only keeps every Nth record.
+
+Environment:
+    LOG_LEVEL            default INFO
+    LOG_DIR              default current directory
+    LOG_MAX_MB           rotate after this many MB (default 5)
+    LOG_BACKUPS          rotated files kept (default 3)
+    LOG_PACKET_SAMPLE    keep 1 in N per-packet records (default 100)
+"""
+import atexit
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+_listener = None
+_setup_lock = threading.Lock()
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s [%(processName)s/%(threadName)s] %(name)s: %(message)s"
+
+
+class SamplingFilter(logging.Filter):
+    """Passes one record in every `rate`; warnings and above always pass."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = max(1, int(rate))
+        self._counter = itertools.count()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        return next(self._counter) % self.rate == 0
+
+
+def setup_logging(log_name):
+    """
+    Configures the root 'handsignify' logger once per process.
+    `log_name` is the file name written under LOG_DIR, e.g. 'diagnostic_debug.log'.
+    """
+    global _listener
+    with _setup_lock:
+        root = logging.getLogger("handsignify")
+        if _listener is not None:
+            return root
+
+        level = getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO)
+        log_dir = os.environ.get("LOG_DIR", ".")
+        os.makedirs(log_dir, exist_ok=True)
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, log_name),
+            maxBytes=int(float(os.environ.get("LOG_MAX_MB", 5)) * 1024 * 1024),
+            backupCount=int(os.environ.get("LOG_BACKUPS", 3)),
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(formatter)
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        console_handler.setLevel(max(level, logging.INFO))
+
+        # Bounded so a stalled disk drops diagnostics instead of growing memory
+        log_queue = queue.Queue(maxsize=10000)
+        queue_handler = _DroppingQueueHandler(log_queue)
+
+        root.setLevel(level)
+        root.addHandler(queue_handler)
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        return root
+
+
+def get_logger(name):
+    return logging.getLogger("handsignify." + name)
+
+
+def get_packet_logger(name):
+    """Logger for per-packet/per-frame DEBUG records, sampled by LOG_PACKET_SAMPLE."""
+    logger = get_logger(name + ".packets")
+    if not any(isinstance(f, SamplingFilter) for f in logger.filters):
+        logger.addFilter(SamplingFilter(os.environ.get("LOG_PACKET_SAMPLE", 100)))
+    return logger
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
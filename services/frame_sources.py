@@ -0,0 +1,153 @@
+"""
+Frame sources for the recognition pipeline.
+
+Both sources follow the cv2.VideoCapture surface the engine already uses
+(isOpened / read / release), so the same loop runs on a live webcam or on
+recorded input:
+
+    CameraSource()                      device 0, 640x480
+    ReplaySource.from_path('data')      data/<class>/*.jpg, labelled by folder
+    ReplaySource.from_path('clip.mp4')  a recorded video
+"""
+import os
+import time
+
+import cv2
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+
+
+class CameraSource:
+    def __init__(self, device=0, width=640, height=480):
+        # Use CAP_DSHOW for faster startup/MJPEG on Windows
+        self.cap = cv2.VideoCapture(device, cv2.CAP_DSHOW)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.current_label = None
+        self.finished = False
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+
+class ReplaySource:
+    """
+    Replays image files and video files in a fixed order at a controlled rate.
+    `items` is a list of (path, label); label is the ground-truth class or None.
+    fps=0 replays as fast as the consumer reads. With loop=False, `finished`
+    becomes True after the last frame and read() returns (False, None).
+    """
+
+    def __init__(self, items, fps=0, loop=False):
+        self.items = list(items)
+        self.fps = fps
+        self.loop = loop
+        self.current_label = None
+        self.current_path = None
+        self.finished = not self.items
+        self._index = 0
+        self._video = None
+        self._frames_read = 0
+        self._started_at = None
+
+    @classmethod
+    def from_path(cls, path, fps=0, loop=False, limit_per_class=None):
+        return cls(discover(path, limit_per_class), fps=fps, loop=loop)
+
+    def isOpened(self):
+        return bool(self.items)
+
+    def read(self):
+        if self.finished:
+            return False, None
+        self._pace()
+
+        while True:
+            if self._video is not None:
+                ok, frame = self._video.read()
+                if ok:
+                    return self._emit(frame)
+                self._video.release()
+                self._video = None
+                self._advance()
+                if self.finished:
+                    return False, None
+                continue
+
+            path, label = self.items[self._index]
+            self.current_path, self.current_label = path, label
+            if path.lower().endswith(VIDEO_EXTENSIONS):
+                self._video = cv2.VideoCapture(path)
+                continue
+
+            frame = cv2.imread(path)
+            self._advance()
+            if frame is not None:
+                return self._emit(frame)
+            if self.finished:
+                return False, None
+
+    def release(self):
+        if self._video is not None:
+            self._video.release()
+            self._video = None
+        self.finished = True
+
+    def _emit(self, frame):
+        self._frames_read += 1
+        return True, frame
+
+    def _advance(self):
+        self._index += 1
+        if self._index >= len(self.items):
+            if self.loop:
+                self._index = 0
+            else:
+                self.finished = True
+
+    def _pace(self):
+        if not self.fps:
+            return
+        now = time.perf_counter()
+        if self._started_at is None:
+            self._started_at = now
+            return
+        due = self._started_at + self._frames_read / self.fps
+        if due > now:
+            time.sleep(due - now)
+
+
+def _natural_key(name):
+    stem = os.path.splitext(name)[0]
+    return (0, int(stem), name) if stem.isdigit() else (1, 0, name)
+
+
+def discover(path, limit_per_class=None):
+    """
+    Builds a deterministic (path, label) list.
+    - A file is replayed on its own, labelled by its parent folder
+    - A folder of class sub-folders (like data/) yields every media file, labelled by sub-folder
+    - A folder of media files is labelled by the folder name
+    """
+    media = IMAGE_EXTENSIONS + VIDEO_EXTENSIONS
+    if os.path.isfile(path):
+        return [(path, os.path.basename(os.path.dirname(os.path.abspath(path))))]
+
+    items = []
+    entries = sorted(os.listdir(path), key=_natural_key)
+    subdirs = [e for e in entries if os.path.isdir(os.path.join(path, e))]
+    groups = [(os.path.join(path, d), d) for d in subdirs] or [(path, os.path.basename(os.path.abspath(path)))]
+
+    for folder, label in groups:
+        files = [f for f in sorted(os.listdir(folder), key=_natural_key) if f.lower().endswith(media)]
+        if limit_per_class:
+            files = files[:limit_per_class]
+        items.extend((os.path.join(folder, f), label) for f in files)
+    return items
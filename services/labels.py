@@ -0,0 +1,12 @@
+# Classifier label -> display text (models/model.p predicts the string class index)
+labels_dict = {
+    '0': 'A', '1': 'B', '2': 'C', '3': 'D', '4': 'E', '5': 'F', '6': 'G', '7': 'H', '8': 'I', 
+    '9': 'J', '10': 'K', '11': 'L', '12': 'M', '13': 'N', '14': 'O', '15': 'P', '16': 'Q', 
+    '17': 'R', '18': 'S', '19': 'T', '20': 'U', '21': 'V', '22': 'W', '23': 'X', '24': 'Y', 
+    '25': 'Z', '26': 'Hello', '27': 'Done', '28': 'Thank You', '29': 'I Love you', 
+    '30': 'Sorry', '31': 'Please', '32': 'You are welcome.'
+}
+
+
+def label_to_text(label):
+    return labels_dict.get(label, label)
@@ -0,0 +1,204 @@
+"""
+Minimal in-process metrics with Prometheus text exposition.
+
+Counters, gauges and HDR-style histograms (log-linear buckets: a fixed number
+of sub-buckets per power of two, so relative error stays constant from
+sub-millisecond to multi-second latencies). Registries can be snapshotted to
+JSON so the camera engine process can push its metrics to app.py, which
+serves everything from one /metrics endpoint.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+
+def log_linear_buckets(lowest=0.0001, highest=10.0, sub_buckets=4):
+    """Bucket upper bounds from `lowest` to `highest` seconds, `sub_buckets` per doubling."""
+    bounds = []
+    base = lowest
+    while base < highest:
+        step = base / sub_buckets
+        for i in range(1, sub_buckets + 1):
+            bounds.append(round(base + step * i, 9))
+        base *= 2
+    return bounds
+
+
+DEFAULT_BUCKETS = log_linear_buckets()
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set(self, value):
+        with self._lock:
+            self.value = value
+
+
+class _HistogramChild:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        idx = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (0-100)."""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return 0.0
+        rank = total * q / 100.0
+        seen = 0
+        for idx, c in enumerate(counts):
+            seen += c
+            if seen >= rank:
+                return self.bounds[idx] if idx < len(self.bounds) else float('inf')
+        return float('inf')
+
+
+class _Family:
+    def __init__(self, kind, name, documentation, labelnames, child_factory):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._child_factory = child_factory
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = child_factory()
+
+    def labels(self, **labels):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._child_factory()
+        return child
+
+    def children(self):
+        with self._lock:
+            return list(self._children.items())
+
+    # Unlabelled families proxy straight to their single child
+    def __getattr__(self, attr):
+        if attr.startswith('_') or self.labelnames:
+            raise AttributeError(attr)
+        return getattr(self._children[()], attr)
+
+
+class Registry:
+    def __init__(self):
+        self._families = {}
+
+    def _register(self, kind, name, documentation, labelnames, factory):
+        if name not in self._families:
+            self._families[name] = _Family(kind, name, documentation, labelnames, factory)
+        return self._families[name]
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register('counter', name, documentation, labelnames, _CounterChild)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register('gauge', name, documentation, labelnames, _GaugeChild)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register('histogram', name, documentation, labelnames,
+                              lambda: _HistogramChild(list(buckets)))
+
+    # ------------------- Snapshot (for cross-process push) -------------------
+    def snapshot(self):
+        families = []
+        for fam in self._families.values():
+            samples = []
+            for key, child in fam.children():
+                if fam.kind == 'histogram':
+                    with child._lock:
+                        samples.append([list(key), {'bounds': child.bounds, 'counts': list(child.counts),
+                                                    'sum': child.sum, 'count': child.count}])
+                else:
+                    samples.append([list(key), child.value])
+            families.append({'kind': fam.kind, 'name': fam.name, 'help': fam.documentation,
+                             'labelnames': list(fam.labelnames), 'samples': samples})
+        return {'families': families}
+
+    @classmethod
+    def from_snapshot(cls, data):
+        registry = cls()
+        for f in data.get('families', []):
+            if f['kind'] == 'histogram':
+                first = f['samples'][0][1]['bounds'] if f['samples'] else DEFAULT_BUCKETS
+                fam = registry.histogram(f['name'], f['help'], f['labelnames'], first)
+            else:
+                fam = registry._register(f['kind'], f['name'], f['help'], f['labelnames'],
+                                         _GaugeChild if f['kind'] == 'gauge' else _CounterChild)
+            for key, value in f['samples']:
+                child = fam.labels(**dict(zip(f['labelnames'], key))) if f['labelnames'] else fam._children[()]
+                if f['kind'] == 'histogram':
+                    child.bounds, child.counts = value['bounds'], value['counts']
+                    child.sum, child.count = value['sum'], value['count']
+                else:
+                    child.value = value
+        return registry
+
+    # ------------------- Prometheus text format -------------------
+    def render(self):
+        lines = []
+        for fam in self._families.values():
+            lines.append('# HELP %s %s' % (fam.name, fam.documentation))
+            lines.append('# TYPE %s %s' % (fam.name, fam.kind))
+            for key, child in sorted(fam.children()):
+                labels = list(zip(fam.labelnames, key))
+                if fam.kind == 'histogram':
+                    with child._lock:
+                        counts, total, count = list(child.counts), child.sum, child.count
+                    cumulative = 0
+                    for bound, c in zip(child.bounds + [float('inf')], counts):
+                        cumulative += c
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append('%s_bucket%s %d' % (fam.name, _fmt_labels(labels + [('le', le)]), cumulative))
+                    lines.append('%s_sum%s %r' % (fam.name, _fmt_labels(labels), total))
+                    lines.append('%s_count%s %d' % (fam.name, _fmt_labels(labels), count))
+                else:
+                    lines.append('%s%s %r' % (fam.name, _fmt_labels(labels), float(child.value)))
+        return '\n'.join(lines) + '\n'
+
+
+def _fmt_labels(pairs):
+    if not pairs:
+        return ''
+    escaped = ('%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+               for k, v in pairs)
+    return '{' + ','.join(escaped) + '}'
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
@@ -0,0 +1,126 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from email.utils import formatdate, parsedate_to_datetime
+
+from flask import Response, request, session
+
+# Optional: brotli variant is only produced when the package is installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class PageCache:
+    """
+    In-memory cache for pages whose HTML doesn't depend on the request.
+    - Rendered once per (path, variant), with gzip/brotli bodies compressed once
+    - ETag / Last-Modified validators with 304 responses
+    - `vary` returns the session state the templates read (base.html shows the
+      logged-in user's name), so each distinct value gets its own entry
+    Requests with pending flash messages bypass the cache, since rendering consumes them.
+    At most `max_entries` entries are kept (least recently used evicted first), and
+    expired entries are dropped whenever a new one is stored.
+    """
+
+    def __init__(self, app, vary=None, ttl=None, enabled=None, max_entries=None):
+        self.app = app
+        self.vary = vary or (lambda: None)
+        self.ttl = ttl or float(os.environ.get('PAGE_CACHE_TTL', 300))
+        self.max_entries = max_entries or int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', 256))
+        if enabled is None:
+            enabled = os.environ.get('PAGE_CACHE_ENABLED', 'true').lower() == 'true'
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cached(self, view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not self.enabled or request.method not in ('GET', 'HEAD') or session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            key = (request.path, self.vary())
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+            if entry is None or time.time() - entry['created'] > self.ttl:
+                rendered = view(*args, **kwargs)
+                if not isinstance(rendered, str):
+                    return rendered
+                entry = self._build_entry(rendered)
+                self._store(key, entry)
+            return self._respond(entry)
+        return wrapper
+
+    def _store(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            expired = [k for k, e in self._entries.items() if entry['created'] - e['created'] > self.ttl]
+            for k in expired:
+                del self._entries[k]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _build_entry(html):
+        body = html.encode('utf-8')
+        created = time.time()
+        entry = {
+            'created': created,
+            'etag': hashlib.sha1(body).hexdigest(),
+            'last_modified': formatdate(int(created), usegmt=True),
+            'identity': body,
+            'gzip': gzip.compress(body, compresslevel=9),
+        }
+        if brotli is not None:
+            entry['br'] = brotli.compress(body)
+        return entry
+
+    def _respond(self, entry):
+        headers = {
+            'ETag': '"%s"' % entry['etag'],
+            'Last-Modified': entry['last_modified'],
+            'Cache-Control': 'no-cache',
+            'Vary': 'Accept-Encoding, Cookie',
+        }
+
+        if self._not_modified(entry):
+            return Response(status=304, headers=headers)
+
+        accepted = request.headers.get('Accept-Encoding', '')
+        for encoding in ('br', 'gzip'):
+            if encoding in entry and encoding in accepted:
+                headers['Content-Encoding'] = encoding
+                body = entry[encoding]
+                break
+        else:
+            body = entry['identity']
+
+        return Response(body, mimetype='text/html', headers=headers)
+
+    @staticmethod
+    def _not_modified(entry):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            tags = [t.strip().removeprefix('W/').strip('"') for t in if_none_match.split(',')]
+            return entry['etag'] in tags or '*' in tags
+
+        if_modified_since = request.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= int(entry['created'])
+            except (TypeError, ValueError):
+                return False
+        return False
@@ -1,9 +1,10 @@
 import os
 import time
-import requests
 import uuid
 import cv2
 import numpy as np
+from services.sign_speak_client import SignSpeakClient
+from services.asset_store import GeneratedAssetStore
 
 class SignLanguageService:
     """
@@ -15,8 +16,17 @@ class SignLanguageService:
     def __init__(self):
         self.api_key = os.environ.get("SIGN_LANGUAGE_API_KEY")
         self.api_url = os.environ.get("SIGN_LANGUAGE_API_URL", "https://api.sign-speak.com/produce-sign")
+        self.ai_client = SignSpeakClient(self.api_url, self.api_key) if self.api_key else None
         self.output_dir = os.path.join('static', 'generated_assets')
-        os.makedirs(self.output_dir, exist_ok=True)
+        self.assets = GeneratedAssetStore(self.output_dir)
+
+        # Shared by the MP4 writer and the client-side pose timeline
+        self.fps = 20
+        self.frame_size = (640, 480)
+        self.letter_hold_frames = 12
+        self.space_hold_frames = 15
+        # Pose coordinates are sent to the browser as integers in [0, pose_scale]
+        self.pose_scale = 1000
         
         # Hand Skeleton Connections (Standard 21-point MediaPipe model)
         self.connections = [
@@ -64,40 +74,92 @@ class SignLanguageService:
         if not text:
             return {"success": False, "error": "Empty text"}
 
-        if self.api_key:
+        if self.ai_client:
             res = self._call_ai_service(text)
             if res.get('success'): return res
 
         return self._render_skeletal_speech(text)
 
+    def generate_pose_timeline(self, text, sign_language="ASL"):
+        """
+        Returns the pose sequence for `text` so the browser can draw it on a canvas.
+
+        Poses are quantized to integers and delta-encoded against the previous
+        distinct pose; the timeline is run-length encoded as [pose_index, frames]
+        pairs, with -1 marking blank (space) frames.
+        """
+        if not text:
+            return {"success": False, "error": "Empty text"}
+
+        poses = []
+        pose_index = {}
+        timeline = []
+        previous = None
+        for pose, hold in self._build_segments(text):
+            if pose is None:
+                idx = -1
+            else:
+                key = tuple(pose)
+                if key not in pose_index:
+                    quantized = [int(round(c * self.pose_scale)) for point in pose for c in point]
+                    if previous is None:
+                        poses.append(quantized)
+                    else:
+                        poses.append([q - p for q, p in zip(quantized, previous)])
+                    previous = quantized
+                    pose_index[key] = len(poses) - 1
+                idx = pose_index[key]
+
+            if timeline and timeline[-1][0] == idx:
+                timeline[-1][1] += hold
+            else:
+                timeline.append([idx, hold])
+
+        width, height = self.frame_size
+        return {
+            "success": True,
+            "format": "pose-timeline",
+            "version": 1,
+            "language": sign_language,
+            "fps": self.fps,
+            "width": width,
+            "height": height,
+            "scale": self.pose_scale,
+            "points": 21,
+            "connections": self.connections,
+            "poses": poses,
+            "timeline": timeline,
+            "provider": "Realistic Skeletal Engine (Client)",
+        }
+
+    def _build_segments(self, text):
+        """Yields (pose, hold_frames) pairs for the fingerspelled text; pose is None for a space."""
+        for char in text.upper():
+            if char in self.letter_poses:
+                yield self.letter_poses[char], self.letter_hold_frames
+            elif char == " ":
+                yield None, self.space_hold_frames
+
     def _call_ai_service(self, text):
         payload = {"englishstring": text, "request_class": "BLOCKING", "identity": "FEMALE"}
-        headers = {"X-api-key": self.api_key, "Content-Type": "application/json"}
-        try:
-            response = requests.post(self.api_url, json=payload, headers=headers, timeout=15)
-            if response.status_code == 200:
-                filename = f"ai_{uuid.uuid4().hex[:8]}.mp4"
-                filepath = os.path.join(self.output_dir, filename)
-                with open(filepath, 'wb') as f: f.write(response.content)
-                return {"success": True, "video_url": f"/static/generated_assets/{filename}", "provider": "Sign-Speak AI"}
-        except: pass
+        filename = f"ai_{uuid.uuid4().hex[:8]}.mp4"
+        filepath = os.path.join(self.output_dir, filename)
+        if self.ai_client.produce_sign(payload, filepath):
+            self.assets.touch(filename)
+            return {"success": True, "video_url": f"/static/generated_assets/{filename}", "provider": "Sign-Speak AI"}
         return {"success": False}
 
     def _render_skeletal_speech(self, text):
-        text = text.upper()
         frames = []
-        for char in text:
-            if char in self.letter_poses:
-                pose = self.letter_poses[char]
-                for _ in range(12): frames.append(pose)
-            elif char == " ":
-                for _ in range(15): frames.append(None) # Blank frames for space
+        for pose, hold in self._build_segments(text):
+            frames.extend([pose] * hold) # None renders as a blank frame
 
         filename = f"skeletal_{uuid.uuid4().hex[:8]}.mp4"
-        output_path = os.path.join(self.output_dir, filename)
+        temp_path = self.assets.temp_path_for(filename)
         
         try:
-            self._write_skeletal_video(frames, output_path)
+            self._write_skeletal_video(frames, temp_path)
+            self.assets.commit(temp_path, filename)
             return {
                 "success": True,
                 "video_url": f"/static/generated_assets/{filename}",
@@ -105,16 +167,17 @@ class SignLanguageService:
                 "note": "Using high-fidelity hand skeleton for authentic fingerspelling."
             }
         except Exception as e:
+            self.assets.discard(temp_path)
             return {"success": False, "error": str(e)}
 
     def _write_skeletal_video(self, frames, output_path):
-        width, height = 640, 480
+        width, height = self.frame_size
         # Use H.264 for compatibility
         fourcc = cv2.VideoWriter_fourcc(*'avc1')
-        out = cv2.VideoWriter(output_path, fourcc, 20, (width, height))
+        out = cv2.VideoWriter(output_path, fourcc, self.fps, (width, height))
         
         if not out.isOpened():
-            out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), 20, (width, height))
+            out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), self.fps, (width, height))
 
         for pose in frames:
             img = np.zeros((height, width, 3), dtype=np.uint8)
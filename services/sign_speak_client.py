@@ -0,0 +1,167 @@
+import os
+import time
+import random
+import threading
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+
+class CircuitBreaker:
+    """
+    Skips calls to a failing backend.
+    After `failure_threshold` consecutive failures the circuit opens for
+    `reset_timeout` seconds. Then it is half-open: exactly one caller is let
+    through as a probe; its success closes the circuit, its failure re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def release(self):
+        """Gives back an admitted call that never reached the backend, so another caller can probe."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        with self._lock:
+            return self._state != self.CLOSED
+
+
+class SignSpeakClient:
+    """
+    Pooled HTTP client for the Sign-Speak AI backend.
+    - One keep-alive Session shared by all request threads
+    - Bounded concurrency: callers that can't get a slot fall back immediately
+    - Retries connection errors and 5xx/429 with exponential backoff and full jitter;
+      a read timeout is never retried, so a slow vendor costs one read_timeout per call
+    - Circuit breaker so a failing vendor doesn't cost every request a timeout
+    - Response body streamed to a temp file and renamed into place
+    """
+
+    def __init__(self, api_url, api_key,
+                 max_concurrency=None, retries=None, connect_timeout=None, read_timeout=None):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency or int(os.environ.get("SIGN_LANGUAGE_API_MAX_CONCURRENCY", 4))
+        self.retries = retries if retries is not None else int(os.environ.get("SIGN_LANGUAGE_API_RETRIES", 2))
+        self.connect_timeout = connect_timeout or float(os.environ.get("SIGN_LANGUAGE_API_CONNECT_TIMEOUT", 3.05))
+        self.read_timeout = read_timeout or float(os.environ.get("SIGN_LANGUAGE_API_READ_TIMEOUT", 15))
+        self.backoff_base = 0.25
+        self.backoff_max = 2.0
+        self.chunk_size = 64 * 1024
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"X-api-key": self.api_key or "", "Content-Type": "application/json"})
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(os.environ.get("SIGN_LANGUAGE_API_BREAKER_THRESHOLD", 3)),
+            reset_timeout=float(os.environ.get("SIGN_LANGUAGE_API_BREAKER_RESET", 30)),
+        )
+
+    def produce_sign(self, payload, dest_path):
+        """
+        POSTs `payload` and streams the returned video to `dest_path`.
+        Returns True on success, False if the AI path should be skipped.
+        """
+        if not self.breaker.allow():
+            return False
+        if not self._slots.acquire(blocking=False):
+            self.breaker.release()
+            return False
+
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    time.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt))))
+                try:
+                    if self._download(payload, dest_path):
+                        self.breaker.record_success()
+                        return True
+                    break  # Non-retryable response (e.g. bad key or payload)
+                except requests.RequestException as e:
+                    if _is_timeout(e):
+                        # Every timed-out attempt counts, so a slow vendor opens the circuit quickly
+                        # Already recorded, so return instead of falling through to the post-loop record
+                        self.breaker.record_failure()
+                        last_attempt = attempt == self.retries
+                        if last_attempt or not isinstance(e, requests.ConnectTimeout) or not self.breaker.allow():
+                            return False
+                    continue
+                except OSError:
+                    break
+            self.breaker.record_failure()
+            return False
+        finally:
+            self._slots.release()
+
+    def _download(self, payload, dest_path):
+        with self.session.post(self.api_url, json=payload, stream=True,
+                               timeout=(self.connect_timeout, self.read_timeout)) as response:
+            if response.status_code == 429 or response.status_code >= 500:
+                response.raise_for_status()
+            if response.status_code != 200:
+                return False
+
+            tmp_path = dest_path + ".part"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        if chunk:
+                            f.write(chunk)
+                os.replace(tmp_path, dest_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            return True
+
+    def close(self):
+        self.session.close()
+
+
+def _is_timeout(error):
+    # A read timeout while streaming the body surfaces as ConnectionError(ReadTimeoutError)
+    return isinstance(error, requests.Timeout) or (
+        error.args and isinstance(error.args[0], urllib3.exceptions.ReadTimeoutError))
@@ -0,0 +1,82 @@
+"""
+Local stand-in for the Sign-Speak /produce-sign endpoint.
+
+Lets the AI path of SignLanguageService be exercised without a vendor key:
+
+    python -m services.sign_speak_stub --port 5055 --delay 0.5 --fail-rate 0.2
+    set SIGN_LANGUAGE_API_URL=http://127.0.0.1:5055/produce-sign
+    set SIGN_LANGUAGE_API_KEY=stub
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _default_video():
+    # Any previously generated clip is a realistic payload
+    clips = sorted(glob.glob(os.path.join('static', 'generated_assets', '*.mp4')))
+    return clips[0] if clips else None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real vendor
+    delay = 0.0
+    fail_rate = 0.0
+    video_bytes = b""
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+
+        if self.headers.get('X-api-key') is None:
+            return self._reply(401, b'{"error": "missing api key"}', 'application/json')
+        try:
+            json.loads(body or b'{}')
+        except ValueError:
+            return self._reply(400, b'{"error": "invalid json"}', 'application/json')
+
+        time.sleep(self.delay)
+        if random.random() < self.fail_rate:
+            return self._reply(503, b'{"error": "stub failure"}', 'application/json')
+        return self._reply(200, self.video_bytes, 'video/mp4')
+
+    def _reply(self, status, payload, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host='127.0.0.1', port=5055, delay=0.0, fail_rate=0.0, video_path=None):
+    video_path = video_path or _default_video()
+    video_bytes = b""
+    if video_path:
+        with open(video_path, 'rb') as f:
+            video_bytes = f.read()
+
+    handler = type('ConfiguredStubHandler', (StubHandler,), {
+        'delay': delay, 'fail_rate': fail_rate, 'video_bytes': video_bytes,
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local Sign-Speak stand-in server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--delay', type=float, default=0.0, help="seconds to wait before replying")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument('--video', default=None, help="mp4 returned on success")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.delay, args.fail_rate, args.video)
+    print(f"Sign-Speak stub listening on http://{args.host}:{args.port}/produce-sign")
+    server.serve_forever()
@@ -0,0 +1,80 @@
+import os
+import time
+import threading
+
+
+class StaticAssetIndex:
+    """
+    Cached listing of files under the static folder.
+    Each directory is scanned once; afterwards a single os.stat of the directory
+    (at most every `check_interval` seconds) decides whether to rescan.
+    Adding, removing or renaming a file updates the directory mtime on every
+    platform we run on; in-place overwrites are picked up by `refresh()` or
+    by the next rescan.
+    """
+
+    def __init__(self, root, check_interval=2.0):
+        self.root = root
+        self.check_interval = check_interval
+        self._dirs = {}  # subdir -> {'dir_mtime', 'checked_at', 'files'}
+        self._lock = threading.Lock()
+
+    def files(self, subdir, extensions=None):
+        """
+        Returns [{'name', 'path', 'mtime', 'size'}, ...] for `subdir`, sorted by name.
+        `extensions` filters by suffix, e.g. ('.mp4', '.webm').
+        """
+        entry = self._entry(subdir)
+        files = entry['files'] if entry else []
+        if extensions:
+            files = [f for f in files if f['name'].lower().endswith(tuple(extensions))]
+        return files
+
+    def get(self, subdir, name):
+        for f in self.files(subdir):
+            if f['name'] == name:
+                return f
+        return None
+
+    def refresh(self, subdir=None):
+        with self._lock:
+            if subdir is None:
+                self._dirs.clear()
+            else:
+                self._dirs.pop(subdir, None)
+
+    def _entry(self, subdir):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._dirs.get(subdir)
+            if entry and now - entry['checked_at'] < self.check_interval:
+                return entry
+
+        path = os.path.join(self.root, subdir)
+        try:
+            dir_mtime = os.stat(path).st_mtime
+        except OSError:
+            with self._lock:
+                self._dirs.pop(subdir, None)
+            return None
+
+        if entry and entry['dir_mtime'] == dir_mtime:
+            entry['checked_at'] = now
+            return entry
+
+        entry = {'dir_mtime': dir_mtime, 'checked_at': now, 'files': self._scan(path)}
+        with self._lock:
+            self._dirs[subdir] = entry
+        return entry
+
+    @staticmethod
+    def _scan(path):
+        files = []
+        with os.scandir(path) as it:
+            for e in it:
+                if not e.is_file():
+                    continue
+                st = e.stat()
+                files.append({'name': e.name, 'path': e.path, 'mtime': int(st.st_mtime), 'size': st.st_size})
+        files.sort(key=lambda f: f['name'])
+        return files
@@ -0,0 +1,40 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class WorkerPool:
+    """
+    Small pool of OS threads for CPU-bound work called from request handlers.
+    The size caps how many cores the work can take. Under gevent the work goes
+    to a gevent ThreadPool (real threads, cooperative wait), so it never blocks
+    the event loop; otherwise to a ThreadPoolExecutor.
+    """
+
+    def __init__(self, workers, name):
+        self.workers = workers
+        self.name = name
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        # Created lazily so the async mode (monkey patching) is already decided
+        with self._lock:
+            if self._pool is None:
+                try:
+                    from gevent import monkey
+                    green = monkey.is_module_patched('threading')
+                except ImportError:
+                    green = False
+                if green:
+                    from gevent.threadpool import ThreadPool
+                    self._pool = ThreadPool(self.workers)
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+            return self._pool
+
+    def run(self, fn, *args):
+        """Runs fn(*args) on the pool and waits for its result (exceptions propagate)."""
+        pool = self._get_pool()
+        if isinstance(pool, ThreadPoolExecutor):
+            return pool.submit(fn, *args).result()
+        return pool.apply(fn, args)
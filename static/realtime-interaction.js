@@ -9,68 +9,98 @@ let accumulatedText = "";
 let isAutoSpeakEnabled = true;
 
 /**
- * Initializes WebSocket connection.
+ * Initializes the prediction push channel from the camera server.
+ * Uses Server-Sent Events (one message per change); falls back to long-polling
+ * /prediction?since=<seq> when EventSource is unavailable or the stream fails.
  * @param {object} callbacks - { onPrediction: fn, onStablePrediction: fn, onError: fn }
  */
-let pollInterval = null;
+const PREDICTION_SERVER = 'http://127.0.0.1:5001';
+
+let eventSource = null;
+let longPollController = null;
 
 function initWebSocket(callbacks = {}) {
-    console.log('🔄 Initializing Prediction Poller (Browser Bridge Mode)');
-    
-    if (pollInterval) {
-        clearInterval(pollInterval);
-    }
+    console.log('🔄 Initializing Prediction Stream (SSE)');
 
-    let lastChar = "";
-    let charCount = 0;
-    const STABILITY_THRESHOLD = 5; // signs needed to consider "stable"
+    disconnectWebSocket();
 
-    pollInterval = setInterval(async () => {
-        try {
-            const response = await fetch('http://127.0.0.1:5001/prediction');
-            const data = await response.json();
-            const char = data.prediction;
+    let lastSeq = -1;
+    let lastStableSeq = null;
 
-            if (callbacks.onPrediction) {
-                callbacks.onPrediction(char);
-            }
+    // Server tracks stability; the client only reacts to changes
+    const handleState = (state) => {
+        if (state.seq === lastSeq) return;
+        lastSeq = state.seq;
 
-            // Stability check for auto-accumulation
-            if (char !== "None" && char !== "Hand Detected") {
-                if (char === lastChar) {
-                    charCount++;
-                } else {
-                    lastChar = char;
-                    charCount = 1;
-                }
+        if (callbacks.onPrediction) {
+            callbacks.onPrediction(state.prediction);
+        }
 
-                if (charCount === STABILITY_THRESHOLD) {
-                    console.log('✅ Stable prediction detected:', char);
-                    accumulatedText += char + " ";
-                    if (callbacks.onStablePrediction) {
-                        callbacks.onStablePrediction(char, accumulatedText);
-                    }
-                    if (isAutoSpeakEnabled && window.speechSynthesis) {
-                        speakText(char);
-                    }
-                    charCount = 0; // Reset after accumulation
+        if (lastStableSeq === null) {
+            lastStableSeq = state.stable_seq; // Don't replay a stable sign from before we connected
+        } else if (state.stable_seq !== lastStableSeq) {
+            lastStableSeq = state.stable_seq;
+            const char = state.stable_prediction;
+            console.log('✅ Stable prediction detected:', char);
+            accumulatedText += char + " ";
+            if (callbacks.onStablePrediction) {
+                callbacks.onStablePrediction(char, accumulatedText);
+            }
+            if (isAutoSpeakEnabled && window.speechSynthesis) {
+                speakText(char);
+            }
+        }
+    };
+
+    const startLongPoll = () => {
+        console.log('🔁 Falling back to long-polling');
+        longPollController = new AbortController();
+        const signal = longPollController.signal;
+
+        (async () => {
+            while (!signal.aborted) {
+                try {
+                    const response = await fetch(`${PREDICTION_SERVER}/prediction?since=${lastSeq}`, { signal });
+                    handleState(await response.json());
+                } catch (error) {
+                    if (signal.aborted) return;
+                    if (callbacks.onError) callbacks.onError(error);
+                    await new Promise(resolve => setTimeout(resolve, 1000)); // Back off while the server is down
                 }
-            } else {
-                charCount = 0;
             }
+        })();
+    };
 
-        } catch (error) {
-            // console.error('Poller error:', error);
-            if (callbacks.onError) callbacks.onError(error);
+    if (!window.EventSource) {
+        startLongPoll();
+        return;
+    }
+
+    let opened = false;
+    eventSource = new EventSource(`${PREDICTION_SERVER}/prediction/stream`);
+    eventSource.onopen = () => { opened = true; };
+    eventSource.addEventListener('prediction', (event) => handleState(JSON.parse(event.data)));
+    eventSource.onerror = (error) => {
+        if (callbacks.onError) callbacks.onError(error);
+        // EventSource reconnects by itself once connected; if it never opened, switch transports
+        if (!opened && eventSource) {
+            eventSource.close();
+            eventSource = null;
+            startLongPoll();
         }
-    }, 200); // 5Hz polling
+    };
 }
 
 function disconnectWebSocket() {
-    if (pollInterval) {
-        clearInterval(pollInterval);
-        pollInterval = null;
-        console.log('Poller stopped');
+    if (eventSource) {
+        eventSource.close();
+        eventSource = null;
+        console.log('Prediction stream closed');
+    }
+    if (longPollController) {
+        longPollController.abort();
+        longPollController = null;
+        console.log('Long-poll stopped');
     }
 }
 
@@ -0,0 +1,136 @@
+// sign-pose-player.js
+// Client-side renderer for the skeletal sign engine
+// Draws the pose timeline from /generate_sign_pose_api on a <canvas>,
+// falling back to the server-rendered MP4 from /generate_sign_video_api
+
+class SignPosePlayer {
+    constructor(config) {
+        this.canvas = document.getElementById(config.canvasId);
+        this.videoElement = config.videoElementId ? document.getElementById(config.videoElementId) : null;
+        this.poseApiUrl = config.poseApiUrl || '/generate_sign_pose_api';
+        this.videoApiUrl = config.videoApiUrl || '/generate_sign_video_api';
+        this.frameHandle = null;
+    }
+
+    async play(text, language = 'ASL') {
+        this.stop();
+
+        const canDraw = this.canvas && this.canvas.getContext;
+        if (canDraw) {
+            try {
+                const timeline = await this._post(this.poseApiUrl, text, language);
+                if (timeline.success) {
+                    this._render(timeline);
+                    return timeline;
+                }
+            } catch (error) {
+                console.warn('SignPosePlayer: Pose timeline unavailable, falling back to video', error);
+            }
+        }
+        return this._playVideo(text, language);
+    }
+
+    stop() {
+        if (this.frameHandle) {
+            cancelAnimationFrame(this.frameHandle);
+            this.frameHandle = null;
+        }
+    }
+
+    async _post(url, text, language) {
+        const response = await fetch(url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ text, language })
+        });
+        return response.json();
+    }
+
+    async _playVideo(text, language) {
+        const result = await this._post(this.videoApiUrl, text, language);
+        if (result.success && this.videoElement) {
+            if (this.canvas) this.canvas.style.display = 'none';
+            this.videoElement.style.display = 'block';
+            this.videoElement.src = result.video_url;
+            this.videoElement.play();
+        }
+        return result;
+    }
+
+    // Undo the delta encoding: poses[0] is absolute, every later pose is relative to the one before it
+    static decodePoses(timeline) {
+        const decoded = [];
+        let previous = null;
+        timeline.poses.forEach(delta => {
+            const absolute = previous ? delta.map((d, i) => d + previous[i]) : delta.slice();
+            decoded.push(absolute);
+            previous = absolute;
+        });
+        return decoded;
+    }
+
+    _render(timeline) {
+        const poses = SignPosePlayer.decodePoses(timeline);
+        const ctx = this.canvas.getContext('2d');
+        this.canvas.width = timeline.width;
+        this.canvas.height = timeline.height;
+        this.canvas.style.display = 'block';
+        if (this.videoElement) this.videoElement.style.display = 'none';
+
+        // Expand the run-length timeline into one pose index per frame
+        const frames = [];
+        timeline.timeline.forEach(([poseIndex, hold]) => {
+            for (let i = 0; i < hold; i++) frames.push(poseIndex);
+        });
+
+        const frameDuration = 1000 / timeline.fps;
+        const start = performance.now();
+
+        const draw = (now) => {
+            const frame = Math.floor((now - start) / frameDuration);
+            if (frame >= frames.length) {
+                this.frameHandle = null;
+                return;
+            }
+            this._drawPose(ctx, timeline, frames[frame] >= 0 ? poses[frames[frame]] : null);
+            this.frameHandle = requestAnimationFrame(draw);
+        };
+        this.frameHandle = requestAnimationFrame(draw);
+    }
+
+    _drawPose(ctx, timeline, pose) {
+        const { width, height, scale } = timeline;
+        ctx.fillStyle = 'rgb(28, 30, 32)'; // Same dark graphite as the MP4 renderer
+        ctx.fillRect(0, 0, width, height);
+        if (!pose) return;
+
+        const point = (i) => [pose[i * 2] / scale * width, pose[i * 2 + 1] / scale * height];
+
+        ctx.strokeStyle = 'rgb(200, 200, 200)';
+        ctx.lineWidth = 2;
+        timeline.connections.forEach(([a, b]) => {
+            const [x1, y1] = point(a);
+            const [x2, y2] = point(b);
+            ctx.beginPath();
+            ctx.moveTo(x1, y1);
+            ctx.lineTo(x2, y2);
+            ctx.stroke();
+        });
+
+        for (let i = 0; i < timeline.points; i++) {
+            const [x, y] = point(i);
+            ctx.beginPath();
+            ctx.arc(x, y, 4, 0, Math.PI * 2);
+            ctx.fillStyle = i === 0 ? 'rgb(100, 180, 255)' : 'rgb(255, 220, 100)'; // Wrist vs Fingers
+            ctx.fill();
+            ctx.strokeStyle = '#fff';
+            ctx.lineWidth = 1;
+            ctx.stroke();
+        }
+    }
+}
+
+// Export for module usage (if needed)
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { SignPosePlayer };
+}